@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     max_transcript_chars: int = 12000
     worker_concurrency: int = 2
     chunk_minutes: int = 60
+    stt_concurrency: int = 4
+    stt_batch_size: int = 1
     enable_noise_suppression: bool = True
     noise_frame_size: int = 256
     noise_sample_rate: int = 16000
@@ -46,6 +48,8 @@ class Settings(BaseSettings):
     role_confidence_threshold: float = 0.5
     sentiment_confidence_threshold: float = 0.5
     enable_fallback_prompt: bool = True
+    llm_cache_dir: Path = data_dir / "cache" / "llm"
+    llm_cache_ttl_seconds: int = 604800
     realtime_ingest_token: str = ""
     realtime_negative_sentiment_threshold: float = -0.45
     realtime_high_risk_threshold: float = 0.72
@@ -68,11 +72,13 @@ class Settings(BaseSettings):
     genesys_audiohook_http_timeout_seconds: int = 20
     genesys_audiohook_retry_max_attempts: int = 5
     genesys_audiohook_retry_backoff_seconds: float = 1.5
+    genesys_audiohook_max_inflight_posts: int = 64
     genesys_audiohook_flush_interval_ms: int = 750
     genesys_audiohook_min_chunk_duration_ms: int = 300
     genesys_audiohook_max_chunk_duration_ms: int = 2000
     genesys_audiohook_status_path: Path = data_dir / "runtime" / "genesys_audiohook_status.json"
     genesys_audiohook_health_stale_seconds: int = 90
+    genesys_audiohook_use_uvloop: bool = True
     genesys_login_base_url: str = "https://login.mypurecloud.com"
     genesys_api_base_url: str = "https://api.mypurecloud.com"
     genesys_client_id: str = ""
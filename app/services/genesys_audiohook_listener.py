@@ -1,24 +1,43 @@
 from __future__ import annotations
 
 import asyncio
-import audioop
 import base64
+import functools
+import itertools
 import json
 import logging
 import os
+import random
+import re
+import struct
 import time
+import warnings
 from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from http import HTTPStatus
 from pathlib import Path
-from typing import Any
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Callable, Iterable
+from urllib.parse import unquote_plus, urlparse
 
 import requests
 
 from app.config import settings as app_settings
 
+try:
+    # Deprecated in 3.11/3.12 and removed in 3.13, where the audioop-lts backport provides it.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:  # pragma: no cover - lookup-table fallback below
+    audioop = None
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None
+
 try:
     from websockets.legacy.server import WebSocketServerProtocol
     from websockets.legacy.server import serve as ws_serve
@@ -33,6 +52,20 @@ logger = logging.getLogger(__name__)
 PACKET_TYPE_COMMAND = 0x01
 PACKET_TYPE_AUDIO = 0x10
 MAX_PACKET_PAYLOAD = 0xFFFFFF
+PING_FAST_PATH_MAX_BYTES = 256
+
+_PACKET_HEADER = struct.Struct(">I")
+
+_EVENT_TEXT_KEYS = ("text", "transcript", "utteranceText", "message")
+_EVENT_TEXT_KEY_SET = frozenset(_EVENT_TEXT_KEYS)
+
+_PING_TYPE_MARKER = b'"type":"ping"'
+_TYPE_KEY_MARKER = b'"type"'
+_COMMAND_ID_RE = re.compile(rb'"id"\s*:\s*"([^"\\]*)"')
+_COMMAND_SEQ_RE = re.compile(rb'"seq"\s*:\s*(\d+)')
+_FALLBACK_CALL_ID_SEQ = itertools.count(1)
+_QUERY_CALL_ID_KEYS = ("conversationId", "conversation_id", "callId", "call_id", "id")
+_QUERY_CALL_ID_RE = re.compile(r"(?:^|&)(conversationId|conversation_id|callId|call_id|id)=([^&]+)")
 
 
 @dataclass(frozen=True)
@@ -47,10 +80,12 @@ class GenesysAudioHookListenerConfig:
     http_timeout_seconds: int
     retry_max_attempts: int
     retry_backoff_seconds: float
+    max_inflight_posts: int
     flush_interval_ms: int
     min_chunk_duration_ms: int
     max_chunk_duration_ms: int
     status_path: Path
+    use_uvloop: bool = True
     dry_run: bool = False
 
     @classmethod
@@ -78,10 +113,12 @@ class GenesysAudioHookListenerConfig:
             http_timeout_seconds=max(5, int(app_settings.genesys_audiohook_http_timeout_seconds)),
             retry_max_attempts=max(1, int(app_settings.genesys_audiohook_retry_max_attempts)),
             retry_backoff_seconds=max(0.2, float(app_settings.genesys_audiohook_retry_backoff_seconds)),
+            max_inflight_posts=max(1, int(app_settings.genesys_audiohook_max_inflight_posts)),
             flush_interval_ms=max(120, int(app_settings.genesys_audiohook_flush_interval_ms)),
             min_chunk_duration_ms=max(80, int(app_settings.genesys_audiohook_min_chunk_duration_ms)),
             max_chunk_duration_ms=max(120, int(app_settings.genesys_audiohook_max_chunk_duration_ms)),
             status_path=Path(app_settings.genesys_audiohook_status_path),
+            use_uvloop=bool(app_settings.genesys_audiohook_use_uvloop),
             dry_run=bool(dry_run),
         )
 
@@ -89,6 +126,24 @@ class GenesysAudioHookListenerConfig:
         return replace(self, **kwargs)
 
 
+class PcmBufferPool:
+    """Recycles fixed-size buffers used to stage outbound PCM chunks."""
+
+    def __init__(self, size: int, depth: int = 2) -> None:
+        self.size = size
+        self.depth = depth
+        self._free = [bytearray(size) for _ in range(depth)]
+
+    def acquire(self) -> bytearray:
+        if self._free:
+            return self._free.pop()
+        return bytearray(self.size)
+
+    def release(self, buffer: bytearray) -> None:
+        if len(buffer) == self.size and len(self._free) < self.depth:
+            self._free.append(buffer)
+
+
 @dataclass
 class AudioHookConnection:
     websocket: WebSocketServerProtocol
@@ -103,8 +158,11 @@ class AudioHookConnection:
     opened: bool = False
     seq_counter: int = 0
     audio_buffer: bytearray = field(default_factory=bytearray)
+    pcm_pool: PcmBufferPool | None = None
     audio_packet_count: int = 0
     raw_audio_bytes: int = 0
+    pending_audio_packets: int = 0
+    pending_audio_bytes: int = 0
     last_flush_monotonic: float = field(default_factory=time.monotonic)
     opened_at: datetime = field(default_factory=lambda: datetime.utcnow().replace(tzinfo=timezone.utc))
     end_event_emitted: bool = False
@@ -115,8 +173,17 @@ class GenesysAudioHookListener:
         self.config = config
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "call-analytics-genesys-audiohook/1.0"})
+        self._forward_executor = ThreadPoolExecutor(
+            max_workers=self.config.max_inflight_posts,
+            thread_name_prefix="audiohook-forward",
+        )
+        self._forward_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._ingest_headers: dict[str, str] = {"Content-Type": "application/json"}
+        if self.config.target_ingest_token:
+            self._ingest_headers["X-Cloud-Token"] = self.config.target_ingest_token
         self._stop_event = asyncio.Event()
         self._status_lock = asyncio.Lock()
+        self._connections: dict[str, AudioHookConnection] = {}
         now = _utc_iso_now()
         self._status: dict[str, object] = {
             "state": "initialized",
@@ -149,10 +216,15 @@ class GenesysAudioHookListener:
                 "websockets is not installed. Install dependencies with: pip install -r requirements.txt"
             )
 
+        if self.config.use_uvloop:
+            _install_uvloop()
+
         try:
             asyncio.run(self._serve())
         except KeyboardInterrupt:
             pass
+        finally:
+            self._forward_executor.shutdown(wait=False)
 
     async def _serve(self) -> None:
         await self._set_status(state="starting")
@@ -180,7 +252,9 @@ class GenesysAudioHookListener:
             await self._set_status(state="running")
             while not self._stop_event.is_set():
                 await asyncio.sleep(0.75)
+                await self._flush_audio_counters(self._connections.values())
 
+        await self._flush_audio_counters(self._connections.values())
         await self._set_status(state="stopped")
         logger.info("genesys_audiohook_listener_stopped")
 
@@ -190,13 +264,27 @@ class GenesysAudioHookListener:
             self._status["updated_at"] = _utc_iso_now()
         await self._persist_status()
 
-    async def _increment_status(self, key: str, amount: int = 1, *, persist: bool = True) -> None:
+    async def _increment_status(self, key: str, amount: int = 1) -> None:
         async with self._status_lock:
             current = int(self._status.get(key) or 0)
             self._status[key] = current + amount
             self._status["updated_at"] = _utc_iso_now()
-        if persist:
-            await self._persist_status()
+        await self._persist_status()
+
+    async def _flush_audio_counters(self, connections: Iterable[AudioHookConnection]) -> None:
+        packets = 0
+        audio_bytes = 0
+        for conn in connections:
+            packets += conn.pending_audio_packets
+            audio_bytes += conn.pending_audio_bytes
+            conn.pending_audio_packets = 0
+            conn.pending_audio_bytes = 0
+        if not packets:
+            return
+        async with self._status_lock:
+            self._status["audio_packets"] = int(self._status.get("audio_packets") or 0) + packets
+            self._status["audio_bytes"] = int(self._status.get("audio_bytes") or 0) + audio_bytes
+            self._status["updated_at"] = _utc_iso_now()
 
     async def _bump_active_connections(self, delta: int) -> None:
         async with self._status_lock:
@@ -210,9 +298,9 @@ class GenesysAudioHookListener:
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
             async with self._status_lock:
-                payload = dict(self._status)
+                blob = _json_dumps(self._status, indent=True)
             temp_path = path.with_suffix(path.suffix + ".tmp")
-            temp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            temp_path.write_bytes(blob)
             temp_path.replace(path)
         except OSError as exc:
             if initial:
@@ -236,7 +324,7 @@ class GenesysAudioHookListener:
             return (
                 HTTPStatus.NOT_FOUND,
                 [("Content-Type", "application/json")],
-                json.dumps({"detail": "Not found"}).encode("utf-8"),
+                _json_dumps({"detail": "Not found"}),
             )
 
         upgrade = str(request_headers.get("Upgrade") or "").strip().lower()
@@ -252,7 +340,7 @@ class GenesysAudioHookListener:
         return (
             HTTPStatus.OK,
             [("Content-Type", "application/json"), ("Cache-Control", "no-store")],
-            json.dumps(payload).encode("utf-8"),
+            _json_dumps(payload),
         )
 
     async def _handle_connection(self, websocket: WebSocketServerProtocol, path: str) -> None:
@@ -263,6 +351,7 @@ class GenesysAudioHookListener:
 
         connection_id = f"{int(time.time() * 1000)}-{id(websocket)}"
         conn = AudioHookConnection(websocket=websocket, path=path, connection_id=connection_id)
+        self._connections[connection_id] = conn
         await self._increment_status("connection_count", 1)
         await self._bump_active_connections(1)
 
@@ -280,6 +369,8 @@ class GenesysAudioHookListener:
         finally:
             await self._flush_audio_buffer(conn, force=True, reason="socket_closed")
             await self._forward_call_end_event(conn, reason="socket_closed")
+            self._connections.pop(connection_id, None)
+            await self._flush_audio_counters((conn,))
             await self._bump_active_connections(-1)
             logger.info("genesys_audiohook_ws_disconnected connection_id=%s", connection_id)
 
@@ -308,9 +399,16 @@ class GenesysAudioHookListener:
         *,
         source: str,
     ) -> None:
+        ping = _match_ping_fast_path(payload)
+        if ping is not None:
+            command_id, seq = ping
+            self._track_command_position(conn, command_id, seq)
+            await self._send_pong(conn, command_id, seq)
+            return
+
         try:
-            command = json.loads(payload.decode("utf-8"))
-        except (UnicodeDecodeError, json.JSONDecodeError):
+            command = _json_loads(payload)
+        except ValueError:
             logger.debug("genesys_audiohook_command_invalid_json connection_id=%s source=%s", conn.connection_id, source)
             return
         if not isinstance(command, dict):
@@ -319,26 +417,14 @@ class GenesysAudioHookListener:
         command_type = str(command.get("type") or "").strip().lower()
         command_id = str(command.get("id") or "").strip()
         seq = _safe_int(command.get("seq"), default=0)
-        if command_id:
-            conn.open_command_id = command_id
-        if seq > conn.seq_counter:
-            conn.seq_counter = seq
+        self._track_command_position(conn, command_id, seq)
 
         if command_type == "open":
             await self._handle_open_command(conn, command)
             return
 
         if command_type == "ping":
-            await self._send_command(
-                conn,
-                {
-                    "version": "2",
-                    "type": "pong",
-                    "id": command_id or conn.open_command_id,
-                    "seq": seq or conn.seq_counter,
-                    "parameters": {},
-                },
-            )
+            await self._send_pong(conn, command_id, seq)
             return
 
         if command_type == "close":
@@ -373,6 +459,24 @@ class GenesysAudioHookListener:
             command_type or "unknown",
         )
 
+    def _track_command_position(self, conn: AudioHookConnection, command_id: str, seq: int) -> None:
+        if command_id:
+            conn.open_command_id = command_id
+        if seq > conn.seq_counter:
+            conn.seq_counter = seq
+
+    async def _send_pong(self, conn: AudioHookConnection, command_id: str, seq: int) -> None:
+        await self._send_command(
+            conn,
+            {
+                "version": "2",
+                "type": "pong",
+                "id": command_id or conn.open_command_id,
+                "seq": seq or conn.seq_counter,
+                "parameters": {},
+            },
+        )
+
     async def _handle_open_command(self, conn: AudioHookConnection, command: dict[str, Any]) -> None:
         parameters = command.get("parameters") if isinstance(command.get("parameters"), dict) else {}
         media = command.get("media") if isinstance(command.get("media"), dict) else {}
@@ -456,9 +560,9 @@ class GenesysAudioHookListener:
         conn.audio_packet_count += 1
         conn.raw_audio_bytes += len(raw_audio)
         conn.audio_buffer.extend(decoded)
+        conn.pending_audio_packets += 1
+        conn.pending_audio_bytes += len(raw_audio)
 
-        await self._increment_status("audio_packets", 1, persist=False)
-        await self._increment_status("audio_bytes", len(raw_audio), persist=False)
         await self._flush_audio_buffer(conn, force=False, reason="streaming")
 
     async def _forward_event_command(self, conn: AudioHookConnection, command: dict[str, Any]) -> None:
@@ -512,16 +616,11 @@ class GenesysAudioHookListener:
             )
             return
 
-        headers: dict[str, str] = {"Content-Type": "application/json"}
-        if self.config.target_ingest_token:
-            headers["X-Cloud-Token"] = self.config.target_ingest_token
-
         try:
-            await asyncio.to_thread(
-                self._request_with_retries,
+            await self._request_with_retries(
                 "POST",
                 self.config.target_event_ingest_url,
-                headers,
+                self._ingest_headers,
                 payload,
             )
             await self._increment_status("forwarded_events", 1)
@@ -543,19 +642,36 @@ class GenesysAudioHookListener:
             if len(conn.audio_buffer) < min_bytes and elapsed_ms < self.config.flush_interval_ms:
                 return
 
+        pool = conn.pcm_pool
+        if pool is None or pool.size != max_bytes:
+            pool = conn.pcm_pool = PcmBufferPool(max_bytes)
+
         while conn.audio_buffer:
             if not force and len(conn.audio_buffer) < min_bytes and elapsed_ms < self.config.flush_interval_ms:
                 break
             chunk_size = min(len(conn.audio_buffer), max_bytes)
-            chunk = bytes(conn.audio_buffer[:chunk_size])
+            buffer = pool.acquire()
+            chunk = memoryview(buffer)[:chunk_size]
+            with memoryview(conn.audio_buffer) as pending:
+                chunk[:] = pending[:chunk_size]
             del conn.audio_buffer[:chunk_size]
-            await self._forward_audio_chunk(conn, chunk, reason=reason)
+            try:
+                await self._forward_audio_chunk(conn, chunk, reason=reason)
+            finally:
+                chunk.release()
+                pool.release(buffer)
             conn.last_flush_monotonic = time.monotonic()
-            elapsed_ms = (time.monotonic() - conn.last_flush_monotonic) * 1000.0
+            elapsed_ms = 0.0
             if not force and len(conn.audio_buffer) < max_bytes:
                 break
 
-    async def _forward_audio_chunk(self, conn: AudioHookConnection, chunk: bytes, *, reason: str) -> None:
+    async def _forward_audio_chunk(
+        self,
+        conn: AudioHookConnection,
+        chunk: bytes | memoryview,
+        *,
+        reason: str,
+    ) -> None:
         if not chunk or not conn.call_id:
             return
         payload = {
@@ -585,16 +701,11 @@ class GenesysAudioHookListener:
             )
             return
 
-        headers: dict[str, str] = {"Content-Type": "application/json"}
-        if self.config.target_ingest_token:
-            headers["X-Cloud-Token"] = self.config.target_ingest_token
-
         try:
-            await asyncio.to_thread(
-                self._request_with_retries,
+            await self._request_with_retries(
                 "POST",
                 self.config.target_audio_ingest_url,
-                headers,
+                self._ingest_headers,
                 payload,
             )
             await self._increment_status("forwarded_chunks", 1)
@@ -613,7 +724,7 @@ class GenesysAudioHookListener:
         frame = _encode_command_packet(command)
         await conn.websocket.send(frame)
 
-    def _request_with_retries(
+    async def _request_with_retries(
         self,
         method: str,
         url: str,
@@ -623,31 +734,32 @@ class GenesysAudioHookListener:
         attempts = self.config.retry_max_attempts
         retryable_codes = {408, 429, 500, 502, 503, 504}
         last_exception: Exception | None = None
+        loop = asyncio.get_running_loop()
+        semaphore = self._forward_semaphore(url)
 
         for attempt in range(1, attempts + 1):
             try:
-                response = self.session.request(
-                    method=method.upper(),
-                    url=url,
-                    headers=headers,
-                    json=payload,
-                    timeout=self.config.http_timeout_seconds,
-                    verify=self.config.verify_ssl,
-                )
+                async with semaphore:
+                    response = await loop.run_in_executor(
+                        self._forward_executor,
+                        self._send_request,
+                        method,
+                        url,
+                        headers,
+                        payload,
+                    )
             except requests.RequestException as exc:
                 last_exception = exc
                 if attempt >= attempts:
                     raise RuntimeError(f"Request failed after retries: {method} {url}") from exc
-                delay = self._retry_delay(attempt)
-                time.sleep(delay)
+                await asyncio.sleep(self._retry_delay(attempt))
                 continue
 
             if response.status_code == 200:
                 return response
 
             if response.status_code in retryable_codes and attempt < attempts:
-                delay = self._retry_delay(attempt)
-                time.sleep(delay)
+                await asyncio.sleep(self._retry_delay(attempt))
                 continue
 
             raise RuntimeError(
@@ -658,8 +770,41 @@ class GenesysAudioHookListener:
             raise RuntimeError(f"Request failed: {method} {url}") from last_exception
         raise RuntimeError(f"Request failed without response: {method} {url}")
 
+    def _forward_semaphore(self, url: str) -> asyncio.Semaphore:
+        semaphore = self._forward_semaphores.get(url)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.config.max_inflight_posts)
+            self._forward_semaphores[url] = semaphore
+        return semaphore
+
+    def _send_request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, object],
+    ) -> requests.Response:
+        return self.session.request(
+            method=method.upper(),
+            url=url,
+            headers=headers,
+            data=_json_dumps(payload),
+            timeout=self.config.http_timeout_seconds,
+            verify=self.config.verify_ssl,
+        )
+
     def _retry_delay(self, attempt: int) -> float:
-        return self.config.retry_backoff_seconds * (2 ** (attempt - 1))
+        delay = self.config.retry_backoff_seconds * (2 ** (attempt - 1))
+        return delay * (0.5 + random.random())
+
+
+def _install_uvloop() -> None:
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("genesys_audiohook_uvloop_unavailable fallback=asyncio")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 def _normalize_path(path: str) -> str:
@@ -679,6 +824,22 @@ def _utc_iso_now() -> str:
     return datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
 
 
+def _json_dumps(payload: object, *, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(payload, indent=2).encode("utf-8")
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
 def _safe_int(value: object, *, default: int = 0) -> int:
     try:
         return int(value)
@@ -686,15 +847,39 @@ def _safe_int(value: object, *, default: int = 0) -> int:
         return default
 
 
+def _match_ping_fast_path(payload: bytes) -> tuple[str, int] | None:
+    # Only a small payload whose single "type" key is the ping marker can be a top-level ping.
+    # Every key used must also sit before any nested object opens; anything ambiguous goes
+    # through the full parse instead.
+    if len(payload) >= PING_FAST_PATH_MAX_BYTES or payload.count(_TYPE_KEY_MARKER) != 1:
+        return None
+    opening = payload.find(b"{")
+    nested = payload.find(b"{", opening + 1)
+    top_level_end = len(payload) if nested == -1 else nested
+    type_at = payload.find(_PING_TYPE_MARKER)
+    if opening == -1 or not opening < type_at < top_level_end:
+        return None
+    id_matches = list(_COMMAND_ID_RE.finditer(payload))
+    seq_matches = list(_COMMAND_SEQ_RE.finditer(payload))
+    if len(id_matches) > 1 or len(seq_matches) > 1:
+        return None
+    if any(match.start() > top_level_end for match in (*id_matches, *seq_matches)):
+        return None
+    command_id = id_matches[0].group(1).decode("utf-8", "replace").strip() if id_matches else ""
+    seq = int(seq_matches[0].group(1)) if seq_matches else 0
+    return command_id, seq
+
+
 def _decode_protocol_packets(data: bytes) -> list[tuple[int, bytes]]:
     packets: list[tuple[int, bytes]] = []
     offset = 0
     total = len(data)
 
-    while offset + 4 <= total:
-        packet_type = data[offset]
-        payload_size = (data[offset + 1] << 16) | (data[offset + 2] << 8) | data[offset + 3]
-        offset += 4
+    while offset + _PACKET_HEADER.size <= total:
+        (word,) = _PACKET_HEADER.unpack_from(data, offset)
+        packet_type = word >> 24
+        payload_size = word & MAX_PACKET_PAYLOAD
+        offset += _PACKET_HEADER.size
         if payload_size < 0 or payload_size > MAX_PACKET_PAYLOAD:
             break
         if offset + payload_size > total:
@@ -706,26 +891,28 @@ def _decode_protocol_packets(data: bytes) -> list[tuple[int, bytes]]:
     return packets
 
 
-def _encode_command_packet(command: dict[str, object]) -> bytes:
-    payload = json.dumps(command, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+def _encode_command_packet(command: dict[str, object]) -> bytearray:
+    payload = _json_dumps(command)
     size = len(payload)
     if size > MAX_PACKET_PAYLOAD:
         raise ValueError("Command payload too large")
-    header = bytes([PACKET_TYPE_COMMAND, (size >> 16) & 0xFF, (size >> 8) & 0xFF, size & 0xFF])
-    return header + payload
+    frame = bytearray(_PACKET_HEADER.size + size)
+    _PACKET_HEADER.pack_into(frame, 0, (PACKET_TYPE_COMMAND << 24) | size)
+    frame[_PACKET_HEADER.size :] = payload
+    return frame
 
 
-def _parse_audio_headers_and_data(payload: bytes) -> tuple[dict[str, object], bytes]:
+def _parse_audio_headers_and_data(payload: bytes) -> tuple[dict[str, object], memoryview]:
     delimiter_index = payload.find(b"\r\n\r\n")
     delimiter_size = 4
     if delimiter_index < 0:
         delimiter_index = payload.find(b"\n\n")
         delimiter_size = 2
     if delimiter_index < 0:
-        return {}, payload
+        return {}, memoryview(payload)
 
     header_blob = payload[:delimiter_index]
-    audio = payload[delimiter_index + delimiter_size :]
+    audio = memoryview(payload)[delimiter_index + delimiter_size :]
     headers: dict[str, object] = {}
 
     for raw_line in header_blob.splitlines():
@@ -741,8 +928,8 @@ def _parse_audio_headers_and_data(payload: bytes) -> tuple[dict[str, object], by
         key = key.strip().lower()
         value = value.strip()
         try:
-            headers[key] = json.loads(value)
-        except json.JSONDecodeError:
+            headers[key] = _json_loads(value)
+        except ValueError:
             headers[key] = value
 
     return headers, audio
@@ -788,7 +975,7 @@ def _extract_call_id(
     parameters: dict[str, Any],
     path: str,
 ) -> str:
-    candidates = [
+    call_id = _first_non_empty(
         parameters.get("conversationId"),
         parameters.get("conversation_id"),
         parameters.get("callId"),
@@ -796,74 +983,136 @@ def _extract_call_id(
         parameters.get("id"),
         command.get("conversationId"),
         command.get("id"),
-    ]
-
-    parsed = urlparse(path)
-    query = parse_qs(parsed.query)
-    for key in ("conversationId", "conversation_id", "callId", "call_id", "id"):
-        values = query.get(key) or []
-        if values:
-            candidates.append(values[0])
-
-    for candidate in candidates:
-        normalized = str(candidate or "").strip()
-        if normalized:
+    ) or _first_non_empty(*_query_call_id_candidates(path))
+    if call_id:
+        return call_id
+
+    # Wall-clock millis keep ids distinct across restarts; the sequence keeps them distinct within one.
+    return f"audiohook-{time.time_ns() // 1_000_000}-{next(_FALLBACK_CALL_ID_SEQ)}"
+
+
+def _first_non_empty(*values: object) -> str:
+    for value in values:
+        if normalized := str(value or "").strip():
             return normalized
+    return ""
 
-    return f"audiohook-{int(time.time() * 1000)}"
+
+def _query_call_id_candidates(path: str) -> list[str]:
+    query = path.partition("?")[2].partition("#")[0]
+    if not query:
+        return []
+    found: dict[str, str] = {}
+    for match in _QUERY_CALL_ID_RE.finditer(query):
+        found.setdefault(match.group(1), match.group(2))
+    return [unquote_plus(found[key]) for key in _QUERY_CALL_ID_KEYS if key in found]
 
 
 def _extract_event_text(parameters: dict[str, Any]) -> str:
-    direct_keys = ("text", "transcript", "utteranceText", "message")
-    for key in direct_keys:
-        value = parameters.get(key)
-        if isinstance(value, str) and value.strip():
-            return value.strip()
+    if text := _first_event_text(parameters):
+        return text
 
     events = parameters.get("events")
     if isinstance(events, list):
         for item in events:
             if not isinstance(item, dict):
                 continue
-            for key in direct_keys:
-                value = item.get(key)
-                if isinstance(value, str) and value.strip():
-                    return value.strip()
+            if text := _first_event_text(item):
+                return text
             nested = item.get("parameters")
-            if isinstance(nested, dict):
-                for key in direct_keys:
-                    value = nested.get(key)
-                    if isinstance(value, str) and value.strip():
-                        return value.strip()
+            if isinstance(nested, dict) and (text := _first_event_text(nested)):
+                return text
+
+    return ""
 
+
+def _first_event_text(payload: dict[str, Any]) -> str:
+    # Most event dicts carry none of the keys; skip the probes then, but keep key priority on a hit.
+    if _EVENT_TEXT_KEY_SET.isdisjoint(payload):
+        return ""
+    for key in _EVENT_TEXT_KEYS:
+        value = payload.get(key)
+        if isinstance(value, str) and (text := value.strip()):
+            return text
     return ""
 
 
-def _decode_to_pcm_s16le(raw_audio: bytes, media_format: str) -> bytes | None:
-    normalized = str(media_format or "").strip().upper()
-    if not normalized:
+def _decode_to_pcm_s16le(
+    raw_audio: bytes | memoryview,
+    media_format: str,
+) -> bytes | bytearray | memoryview | array | None:
+    decoder = _pcm_decoder(media_format)
+    if decoder is None:
         return None
+    return decoder(raw_audio)
+
+
+@functools.lru_cache(maxsize=64)
+def _pcm_decoder(media_format: str) -> Callable[[bytes | memoryview], bytes | bytearray | memoryview | array] | None:
+    return _PCM_DECODERS.get(str(media_format or "").strip().upper())
 
-    if normalized in {"PCMU", "MULAW", "MU-LAW", "ULAW"}:
+
+def _decode_ulaw(raw_audio: bytes | memoryview) -> bytes | bytearray:
+    if audioop is not None:
         return audioop.ulaw2lin(raw_audio, 2)
+    return _g711_to_pcm_s16le(raw_audio, _ULAW_TABLES)
+
 
-    if normalized in {"PCMA", "A-LAW", "ALAW"}:
+def _decode_alaw(raw_audio: bytes | memoryview) -> bytes | bytearray:
+    if audioop is not None:
         return audioop.alaw2lin(raw_audio, 2)
+    return _g711_to_pcm_s16le(raw_audio, _ALAW_TABLES)
+
+
+def _decode_s16le(raw_audio: bytes | memoryview) -> bytes | memoryview:
+    size = len(raw_audio)
+    return raw_audio if size % 2 == 0 else memoryview(raw_audio)[: size - 1]
+
+
+def _decode_s16be(raw_audio: bytes | memoryview) -> array:
+    samples = array("h")
+    samples.frombytes(memoryview(raw_audio)[: len(raw_audio) & ~1])
+    samples.byteswap()
+    return samples
+
+
+def _ulaw_to_linear(value: int) -> int:
+    value = ~value & 0xFF
+    magnitude = (((value & 0x0F) << 3) + 0x84) << ((value & 0x70) >> 4)
+    return 0x84 - magnitude if value & 0x80 else magnitude - 0x84
+
+
+def _alaw_to_linear(value: int) -> int:
+    value ^= 0x55
+    segment = (value & 0x70) >> 4
+    magnitude = (value & 0x0F) << 4
+    if segment == 0:
+        magnitude += 8
+    else:
+        magnitude = (magnitude + 0x108) << (segment - 1)
+    return magnitude if value & 0x80 else -magnitude
+
+
+def _build_g711_tables(expand: Callable[[int], int]) -> tuple[bytes, bytes]:
+    samples = [expand(code).to_bytes(2, "little", signed=True) for code in range(256)]
+    return bytes(sample[0] for sample in samples), bytes(sample[1] for sample in samples)
 
-    if normalized in {"L16LE", "PCM_S16LE", "S16LE"}:
-        return raw_audio if len(raw_audio) % 2 == 0 else raw_audio[:-1]
 
-    if normalized in {"L16", "LINEAR16", "PCM_S16BE", "S16BE"}:
-        clean = raw_audio if len(raw_audio) % 2 == 0 else raw_audio[:-1]
-        return _byteswap_16(clean)
+def _g711_to_pcm_s16le(raw_audio: bytes, tables: tuple[bytes, bytes]) -> bytearray:
+    low_table, high_table = tables
+    raw = bytes(raw_audio)
+    decoded = bytearray(len(raw) * 2)
+    decoded[0::2] = raw.translate(low_table)
+    decoded[1::2] = raw.translate(high_table)
+    return decoded
 
-    return None
 
+_ULAW_TABLES = _build_g711_tables(_ulaw_to_linear)
+_ALAW_TABLES = _build_g711_tables(_alaw_to_linear)
 
-def _byteswap_16(payload: bytes) -> bytes:
-    if not payload:
-        return b""
-    values = array("h")
-    values.frombytes(payload)
-    values.byteswap()
-    return values.tobytes()
+_PCM_DECODERS = {
+    **dict.fromkeys(("PCMU", "MULAW", "MU-LAW", "ULAW"), _decode_ulaw),
+    **dict.fromkeys(("PCMA", "A-LAW", "ALAW"), _decode_alaw),
+    **dict.fromkeys(("L16LE", "PCM_S16LE", "S16LE"), _decode_s16le),
+    **dict.fromkeys(("L16", "LINEAR16", "PCM_S16BE", "S16BE"), _decode_s16be),
+}
@@ -1,23 +1,34 @@
 from __future__ import annotations
 
 import base64
+import functools
 import json
 import logging
 import os
+import queue
+import random
 import re
 import ssl
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
 from dateutil import parser as date_parser
 
 from app.config import settings as app_settings
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None
+
 try:
     import websocket  # type: ignore
 except Exception:  # pragma: no cover - surfaced at runtime in command
@@ -26,6 +37,49 @@ except Exception:  # pragma: no cover - surfaced at runtime in command
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_QUEUE_SIZE = 1024
+NOTIFICATION_WORKER_JOIN_SECONDS = 10.0
+NOTIFICATION_DEDUPE_SIZE = 10_000
+RETRY_BACKOFF_CAP_SECONDS = 30.0
+HEARTBEAT_MAX_CHARS = 256
+DISCOVERY_PAGE_SIZE = 100
+TOPIC_REFRESH_MAX_BACKOFF = 8
+
+_METADATA_TOPIC_MARKER = '"channel.metadata"'
+_RETRYABLE_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+_SENTIMENT_LABEL_SCORES = {"negative": -0.7, "neg": -0.7, "neutral": 0.0, "positive": 0.7, "pos": 0.7}
+_TOPIC_CONVERSATION_ID_RE = re.compile(r"conversations\.([a-f0-9-]{16,})", re.IGNORECASE)
+_ENDED_STATUS_RE = re.compile("disconnect|terminated|ended|complete|closed")
+_ENDED_EVENT_TYPE_RE = re.compile("disconnect|terminate|end|complete")
+_CALL_ID_KEYS = ("conversationId", "conversation_id", "id")
+_CONVERSATION_ID_KEYS = ("id", "conversationId")
+_EVENT_ID_KEYS = ("CorrelationId", "correlationId", "eventId", "event_id")
+_EVENT_TYPE_KEYS = ("eventType", "type")
+_STATUS_KEYS = ("status", "state", "conversationState")
+_SPEAKER_KEYS = ("speaker", "speakerType", "participantPurpose", "purpose", "role")
+_PARTICIPANT_PURPOSE_KEYS = ("purpose", "participantPurpose")
+_AGENT_ID_KEYS = ("agentId", "agent_id", "userId")
+_AGENT_PARTICIPANT_ID_KEYS = ("userId", "id")
+_CUSTOMER_ID_KEYS = ("customerId", "externalContactId", "customer_id")
+_CUSTOMER_PARTICIPANT_ID_KEYS = ("id", "externalContactId")
+_TRANSCRIPT_TEXT_KEYS = ("text", "transcript", "utteranceText")
+_TRANSCRIPT_SPEAKER_KEYS = ("speaker", "participantPurpose", "role")
+_UTTERANCE_TEXT_KEYS = ("text", "utteranceText")
+_UTTERANCE_SPEAKER_KEYS = ("speaker", "role")
+_BODY_TEXT_KEYS = ("text", "transcript", "utteranceText", "message")
+_NESTED_TEXT_KEYS = ("text", "body")
+_SENTIMENT_KEYS = ("sentiment", "sentimentScore", "overallSentiment", "sentiment_score")
+_NESTED_SENTIMENT_KEYS = ("score", "overall", "value")
+_CONFIDENCE_KEYS = ("confidence", "confidenceScore", "sentimentConfidence")
+_NESTED_CONFIDENCE_KEYS = ("confidence", "confidenceScore")
+_ACTIVE_PARTICIPANT_STATES = frozenset(("connected", "alerting"))
+_AGENT_PURPOSES = frozenset(("agent", "user"))
+_CUSTOMER_PURPOSES = frozenset(("customer", "external"))
+_TEXT_RECORD_KEYS = frozenset(("transcripts", "utterances", *_BODY_TEXT_KEYS))
+DISCOVERY_MAX_PAGES = 50
+DISCOVERY_MAX_WORKERS = 8
+DISCOVERY_POOL_SIZE = 16
+
 
 @dataclass(frozen=True)
 class GenesysConnectorConfig:
@@ -104,11 +158,25 @@ class GenesysCloudConnector:
         self.config = config
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "call-analytics-genesys-connector/1.0"})
+        # Retries are handled in _request; size the pool for concurrent discovery page fetches.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=DISCOVERY_POOL_SIZE, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
+        self._retry_random = random.Random()
         self._token: str | None = None
         self._token_expires_at: datetime | None = None
+        self._token_expires_monotonic = 0.0
+        self._token_lock = threading.Lock()
         self._stop_event = threading.Event()
         self._status_lock = threading.Lock()
+        self._status_dirty = threading.Event()
+        self._status_writer: threading.Thread | None = None
+        self._status_writer_stop = threading.Event()
+        # One queue and worker outlive reconnects, so events are forwarded in arrival order.
+        self._notifications: queue.Queue[str] = queue.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        self._notification_worker: threading.Thread | None = None
+        self._notification_worker_stop = threading.Event()
         now = _utc_iso_now()
         self._status: dict[str, object] = {
             "state": "initialized",
@@ -120,6 +188,7 @@ class GenesysCloudConnector:
             "topics_count": 0,
             "forwarded_events": 0,
             "forward_failures": 0,
+            "dropped_messages": 0,
             "reconnect_count": 0,
             "last_error": "",
             "channel_id": "",
@@ -131,8 +200,22 @@ class GenesysCloudConnector:
             "topic_preview": [],
             "topic_builder": {},
         }
+        self._ingest_headers = {"Content-Type": "application/json"}
+        if self.config.target_ingest_token:
+            self._ingest_headers["X-Cloud-Token"] = self.config.target_ingest_token
+        self._queue_name_filter = _compile_term_filter(self.config.topic_builder_queue_name_filters)
+        self._user_name_filter = _compile_term_filter(self.config.topic_builder_user_name_filters)
+        self._user_email_suffixes = tuple(
+            f"@{term.lower().lstrip('@')}"
+            for term in self.config.topic_builder_user_email_domain_filters
+            if term
+        )
         self._last_topic_refresh_at: datetime | None = None
+        self._last_topic_set: frozenset[str] = frozenset()
+        self._topic_refresh_ttl_seconds = float(self.config.topic_builder_refresh_seconds)
         self._cached_topic_preview: dict[str, object] | None = None
+        self._recent_event_keys: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._recent_event_lock = threading.Lock()
         self._persist_status(initial=True)
 
     def stop(self) -> None:
@@ -143,23 +226,65 @@ class GenesysCloudConnector:
         with self._status_lock:
             self._status.update(updates)
             self._status["updated_at"] = _utc_iso_now()
-        self._persist_status()
+        self._mark_status_dirty()
 
     def _increment_status(self, key: str, amount: int = 1) -> None:
         with self._status_lock:
             current = int(self._status.get(key) or 0)
             self._status[key] = current + amount
             self._status["updated_at"] = _utc_iso_now()
+        self._mark_status_dirty()
+
+    def _apply_status_delta(self, increments: dict[str, int], **updates: object) -> None:
+        with self._status_lock:
+            for key, amount in increments.items():
+                self._status[key] = int(self._status.get(key) or 0) + amount
+            self._status.update(updates)
+            self._status["updated_at"] = _utc_iso_now()
+        self._mark_status_dirty()
+
+    def _mark_status_dirty(self) -> None:
+        if self._status_writer is None:
+            self._persist_status()
+            return
+        self._status_dirty.set()
+
+    def _start_status_writer(self) -> None:
+        if self._status_writer is not None:
+            return
+        self._status_writer_stop.clear()
+        self._status_writer = threading.Thread(
+            target=self._status_writer_loop,
+            name="genesys-status-writer",
+            daemon=True,
+        )
+        self._status_writer.start()
+
+    def _stop_status_writer(self) -> None:
+        writer = self._status_writer
+        if writer is None:
+            return
+        self._status_writer = None
+        self._status_writer_stop.set()
+        writer.join(timeout=5)
+        self._status_dirty.clear()
         self._persist_status()
 
+    def _status_writer_loop(self) -> None:
+        # Coalesce bursts of status updates into at most one file write per second.
+        while not self._status_writer_stop.wait(1.0):
+            if self._status_dirty.is_set():
+                self._status_dirty.clear()
+                self._persist_status()
+
     def _persist_status(self, *, initial: bool = False) -> None:
         path = self.config.status_path
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
             with self._status_lock:
-                payload = dict(self._status)
+                blob = _json_dumps(self._status)
             temp_path = path.with_suffix(path.suffix + ".tmp")
-            temp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            temp_path.write_bytes(blob)
             temp_path.replace(path)
         except OSError as exc:
             if initial:
@@ -169,6 +294,16 @@ class GenesysCloudConnector:
 
     def run_forever(self) -> None:
         self._set_status(state="starting")
+        self._start_status_writer()
+        self._start_notification_worker()
+        try:
+            self._run_until_stopped()
+        finally:
+            self._stop_notification_worker()
+            self._stop_status_writer()
+            self.session.close()
+
+    def _run_until_stopped(self) -> None:
         try:
             self._validate_required_config()
         except Exception as exc:
@@ -246,7 +381,7 @@ class GenesysCloudConnector:
         if not isinstance(preset_topics, list):
             preset_topics = []
 
-        merged_topics = sorted({*manual_topics, *[str(topic) for topic in preset_topics if topic]})
+        merged_topics = sorted(manual_topics.union(str(topic) for topic in preset_topics if topic))
         return {
             "topics": merged_topics,
             "manual_topic_count": len(manual_topics),
@@ -254,7 +389,7 @@ class GenesysCloudConnector:
             "builder": builder_preview,
         }
 
-    def _build_manual_topics(self) -> list[str]:
+    def _build_manual_topics(self) -> set[str]:
         topics: set[str] = set(self.config.subscription_topics)
 
         for queue_id in self.config.queue_ids:
@@ -262,7 +397,7 @@ class GenesysCloudConnector:
         for user_id in self.config.user_ids:
             topics.add(f"v2.users.{user_id}.conversations.calls")
 
-        return sorted(topic.strip() for topic in topics if topic.strip())
+        return {topic.strip() for topic in topics if topic.strip()}
 
     def _build_preset_topics(self, *, refresh: bool = False) -> dict[str, object]:
         mode = (self.config.topic_builder_mode or "manual").strip().lower()
@@ -303,8 +438,9 @@ class GenesysCloudConnector:
             "queues": selected_queues,
             "users": selected_users,
         }
-        self._last_topic_refresh_at = datetime.utcnow()
+        self._last_topic_refresh_at = _utc_now()
         self._cached_topic_preview = preview
+        self._update_topic_refresh_ttl(preview["topics"])
 
         logger.info(
             "genesys_topic_builder mode=%s queues=%s users=%s topics=%s",
@@ -318,31 +454,32 @@ class GenesysCloudConnector:
     def _should_refresh_builder_topics(self) -> bool:
         if self._last_topic_refresh_at is None:
             return True
-        elapsed = (datetime.utcnow() - self._last_topic_refresh_at).total_seconds()
-        return elapsed >= self.config.topic_builder_refresh_seconds
+        elapsed = (_utc_now() - self._last_topic_refresh_at).total_seconds()
+        return elapsed >= self._topic_refresh_ttl_seconds
+
+    def _update_topic_refresh_ttl(self, topics: list[str]) -> None:
+        # Back off while discovery keeps returning the same topics; any change restores the base TTL.
+        topic_set = frozenset(topics)
+        base_ttl = float(self.config.topic_builder_refresh_seconds)
+        if topic_set == self._last_topic_set:
+            self._topic_refresh_ttl_seconds = min(
+                base_ttl * TOPIC_REFRESH_MAX_BACKOFF,
+                self._topic_refresh_ttl_seconds * 2,
+            )
+        else:
+            self._topic_refresh_ttl_seconds = base_ttl
+        self._last_topic_set = topic_set
 
     def _discover_queues(self) -> list[dict[str, str]]:
-        filters = [term.lower() for term in self.config.topic_builder_queue_name_filters if term]
+        name_filter = self._queue_name_filter
         max_items = self.config.topic_builder_max_queues
         if max_items == 0:
             return []
 
         discovered: list[dict[str, str]] = []
-        page_number = 1
-        page_size = 100
-        while True:
-            url = f"{self.config.api_base_url}/api/v2/routing/queues"
-            response = self._request(
-                "GET",
-                url,
-                params={"pageSize": page_size, "pageNumber": page_number},
-                expected_status=(200,),
-            )
-            payload = response.json()
-            entities = payload.get("entities")
-            if not isinstance(entities, list) or not entities:
-                break
-
+        url = f"{self.config.api_base_url}/api/v2/routing/queues"
+        page_size = _discovery_page_size(max_items, filtered=name_filter is not None)
+        for entities in self._iter_discovery_pages(url, {}, page_size):
             for entity in entities:
                 if not isinstance(entity, dict):
                     continue
@@ -350,50 +487,25 @@ class GenesysCloudConnector:
                 name = str(entity.get("name") or "").strip()
                 if not queue_id or not name:
                     continue
-                if filters and not any(term in name.lower() for term in filters):
+                if name_filter and not name_filter.search(name):
                     continue
                 discovered.append({"id": queue_id, "name": name})
                 if max_items > 0 and len(discovered) >= max_items:
                     return discovered
 
-            page_count = _parse_int(payload.get("pageCount"))
-            if page_count and page_number >= page_count:
-                break
-            if len(entities) < page_size:
-                break
-            page_number += 1
-            if page_number > 50:
-                break
-
         return discovered
 
     def _discover_users(self) -> list[dict[str, str]]:
-        name_filters = [term.lower() for term in self.config.topic_builder_user_name_filters if term]
-        domain_filters = [
-            term.lower().lstrip("@")
-            for term in self.config.topic_builder_user_email_domain_filters
-            if term
-        ]
+        name_filter = self._user_name_filter
+        email_suffixes = self._user_email_suffixes
         max_items = self.config.topic_builder_max_users
         if max_items == 0:
             return []
 
         discovered: list[dict[str, str]] = []
-        page_number = 1
-        page_size = 100
-        while True:
-            url = f"{self.config.api_base_url}/api/v2/users"
-            response = self._request(
-                "GET",
-                url,
-                params={"pageSize": page_size, "pageNumber": page_number, "state": "active"},
-                expected_status=(200,),
-            )
-            payload = response.json()
-            entities = payload.get("entities")
-            if not isinstance(entities, list) or not entities:
-                break
-
+        url = f"{self.config.api_base_url}/api/v2/users"
+        page_size = _discovery_page_size(max_items, filtered=name_filter is not None or bool(email_suffixes))
+        for entities in self._iter_discovery_pages(url, {"state": "active"}, page_size):
             for entity in entities:
                 if not isinstance(entity, dict):
                     continue
@@ -402,25 +514,79 @@ class GenesysCloudConnector:
                 email = str(entity.get("email") or "").strip().lower()
                 if not user_id:
                     continue
-                if name_filters and not any(term in name.lower() for term in name_filters):
+                if name_filter and not name_filter.search(name):
                     continue
-                if domain_filters and not any(email.endswith(f"@{domain}") for domain in domain_filters):
+                if email_suffixes and not email.endswith(email_suffixes):
                     continue
                 discovered.append({"id": user_id, "name": name, "email": email})
                 if max_items > 0 and len(discovered) >= max_items:
                     return discovered
 
-            page_count = _parse_int(payload.get("pageCount"))
-            if page_count and page_number >= page_count:
-                break
-            if len(entities) < page_size:
-                break
-            page_number += 1
-            if page_number > 50:
-                break
-
         return discovered
 
+    def _iter_discovery_pages(
+        self,
+        url: str,
+        params: dict[str, object],
+        page_size: int = DISCOVERY_PAGE_SIZE,
+    ) -> Iterator[list[Any]]:
+        params = {"pageSize": page_size, **params}
+        entities, page_count = self._fetch_discovery_page(url, params, 1)
+        if not entities:
+            return
+        yield entities
+        if (page_count and page_count <= 1) or len(entities) < page_size:
+            return
+
+        if not page_count:
+            for page_number in range(2, DISCOVERY_MAX_PAGES + 1):
+                entities, _ = self._fetch_discovery_page(url, params, page_number)
+                if not entities:
+                    return
+                yield entities
+                if len(entities) < page_size:
+                    return
+            return
+
+        # pageCount is known after the first page, so fetch the rest concurrently but yield in page order.
+        last_page = min(page_count, DISCOVERY_MAX_PAGES)
+        executor = ThreadPoolExecutor(
+            max_workers=min(DISCOVERY_MAX_WORKERS, last_page - 1),
+            thread_name_prefix="genesys-discovery",
+        )
+        try:
+            futures = [
+                executor.submit(self._fetch_discovery_page, url, params, page_number)
+                for page_number in range(2, last_page + 1)
+            ]
+            for future in futures:
+                entities, _ = future.result()
+                if not entities:
+                    return
+                yield entities
+                if len(entities) < page_size:
+                    return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_discovery_page(
+        self,
+        url: str,
+        params: dict[str, object],
+        page_number: int,
+    ) -> tuple[list[Any], int | None]:
+        response = self._request(
+            "GET",
+            url,
+            params={**params, "pageNumber": page_number},
+            expected_status=(200,),
+        )
+        payload = response.json()
+        entities = payload.get("entities")
+        if not isinstance(entities, list):
+            entities = []
+        return entities, _parse_int(payload.get("pageCount"))
+
     def _build_topics(self) -> list[str]:
         preview = self.build_topics_preview(refresh=False)
         topics = preview.get("topics")
@@ -432,6 +598,7 @@ class GenesysCloudConnector:
         assert websocket is not None
 
         close_info: dict[str, object] = {"code": None, "reason": ""}
+        messages = self._notifications
 
         def on_open(ws_app: object) -> None:
             _ = ws_app
@@ -440,7 +607,13 @@ class GenesysCloudConnector:
 
         def on_message(ws_app: object, message: str) -> None:
             _ = ws_app
-            self._handle_notification_message(message)
+            # Parsing and forwarding run on the notification worker so slow ingest POSTs never
+            # stall the socket reader; a full queue drops the frame rather than blocking.
+            try:
+                messages.put_nowait(message)
+            except queue.Full:
+                self._increment_status("dropped_messages", 1)
+                logger.warning("genesys_message_dropped reason=queue_full size=%s", NOTIFICATION_QUEUE_SIZE)
 
         def on_error(ws_app: object, error: object) -> None:
             _ = ws_app
@@ -483,25 +656,71 @@ class GenesysCloudConnector:
         self._increment_status("reconnect_count", 1)
         self._sleep_with_stop(self.config.reconnect_delay_seconds)
 
+    def _start_notification_worker(self) -> None:
+        if self._notification_worker is not None:
+            return
+        self._notification_worker_stop.clear()
+        self._notification_worker = threading.Thread(
+            target=self._process_notification_queue,
+            name="genesys-notifications",
+            daemon=True,
+        )
+        self._notification_worker.start()
+
+    def _stop_notification_worker(self) -> None:
+        worker = self._notification_worker
+        if worker is None:
+            return
+        self._notification_worker = None
+        self._notification_worker_stop.set()
+        worker.join(timeout=NOTIFICATION_WORKER_JOIN_SECONDS)
+        if worker.is_alive():
+            logger.warning("genesys_notification_worker_still_running")
+
+    def _process_notification_queue(self) -> None:
+        messages = self._notifications
+        while True:
+            if self._stop_event.is_set() or self._notification_worker_stop.is_set():
+                pending = 0
+                while True:
+                    try:
+                        messages.get_nowait()
+                    except queue.Empty:
+                        break
+                    pending += 1
+                if pending:
+                    self._increment_status("dropped_messages", pending)
+                    logger.info("genesys_messages_dropped reason=stopping count=%s", pending)
+                return
+            try:
+                message = messages.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                self._handle_notification_message(message)
+            except Exception as exc:
+                logger.exception("genesys_message_processing_failed error=%s", exc)
+
     def _handle_notification_message(self, message: str) -> None:
+        # Heartbeats are tiny standalone frames; drop them before parsing.
+        if len(message) <= HEARTBEAT_MAX_CHARS and _METADATA_TOPIC_MARKER in message:
+            return
         try:
-            parsed = json.loads(message)
-        except json.JSONDecodeError:
+            parsed = _json_loads(message)
+        except ValueError:
             logger.debug("genesys_message_ignored reason=invalid_json")
             return
 
         notifications = _flatten_notifications(parsed)
         total_payloads = 0
+        failed_payloads = 0
+        last_payload: dict[str, object] | None = None
         for notification in notifications:
             for payload in self._map_notification_to_payloads(notification):
                 try:
                     self._forward_payload(payload)
                     total_payloads += 1
-                    self._set_status(
-                        last_event_at=_utc_iso_now(),
-                        last_payload_call_id=str(payload.get("call_id") or ""),
-                        last_payload_type=str(payload.get("event_type") or ""),
-                    )
+                    last_payload = payload
                 except Exception as exc:
                     logger.exception(
                         "genesys_payload_forward_failed call_id=%s event_type=%s error=%s",
@@ -509,21 +728,46 @@ class GenesysCloudConnector:
                         payload.get("event_type"),
                         exc,
                     )
-                    self._increment_status("forward_failures", 1)
+                    failed_payloads += 1
+
+        if not total_payloads and not failed_payloads:
+            return
 
+        updates: dict[str, object] = {}
+        if last_payload is not None:
+            updates = {
+                "last_event_at": _utc_iso_now(),
+                "last_payload_call_id": str(last_payload.get("call_id") or ""),
+                "last_payload_type": str(last_payload.get("event_type") or ""),
+            }
+        self._apply_status_delta(
+            {"forwarded_events": total_payloads, "forward_failures": failed_payloads},
+            **updates,
+        )
         if total_payloads:
-            self._increment_status("forwarded_events", total_payloads)
             logger.debug("genesys_message_forwarded payloads=%s", total_payloads)
 
+    def _is_duplicate_event(self, call_id: str, event_id: str) -> bool:
+        key = (call_id, event_id)
+        with self._recent_event_lock:
+            recent = self._recent_event_keys
+            if key in recent:
+                recent.move_to_end(key)
+                return True
+            recent[key] = None
+            if len(recent) > NOTIFICATION_DEDUPE_SIZE:
+                recent.popitem(last=False)
+        return False
+
     def _map_notification_to_payloads(
         self,
         notification: dict[str, Any],
-    ) -> list[dict[str, object]]:
+    ) -> Iterator[dict[str, object]]:
         topic = str(notification.get("topicName") or notification.get("topic") or "").strip()
         if not topic:
-            return []
+            return
         if topic.endswith("channel.metadata"):
-            return []
+            return
 
         event_body = notification.get("eventBody")
         if not isinstance(event_body, dict):
@@ -531,93 +775,91 @@ class GenesysCloudConnector:
 
         call_id = self._extract_call_id(topic, event_body)
         if not call_id:
-            return []
+            return
+        # Redeliveries keep their event id even when the envelope differs, so they are dropped
+        # here before the sentiment/confidence/participant extraction below.
+        event_id = self._extract_event_id(notification, event_body)
+        if event_id and self._is_duplicate_event(call_id, event_id):
+            logger.debug("genesys_message_ignored reason=duplicate call_id=%s event_id=%s", call_id, event_id)
+            return
 
         event_type = self._extract_event_type(topic, event_body)
         status = self._extract_status(event_type, event_body)
         sentiment = self._extract_sentiment(event_body)
         confidence = self._extract_confidence(event_body)
         occurred_at = self._extract_occurred_at(notification, event_body)
-        speaker = self._extract_speaker(event_body)
+        speaker, agent_id, customer_id = self._summarize_participants(event_body)
 
         text_records = self._extract_text_records(event_body)
         if not text_records:
             text_records = [{"text": "", "speaker": speaker, "source": "topic_only"}]
 
-        payloads: list[dict[str, object]] = []
+        event_keys = sorted(event_body.keys())[:40]
+        monitoring_metrics = _extract_monitoring_metrics(event_body)
+
         for record in text_records[:6]:
             text = str(record.get("text") or "").strip()
             record_speaker = str(record.get("speaker") or speaker or "").strip().lower()
             metadata = {
                 "genesys_topic": topic,
                 "genesys_source": str(record.get("source") or "event"),
-                "genesys_event_keys": sorted(event_body.keys())[:40],
+                "genesys_event_keys": event_keys,
+                **monitoring_metrics,
             }
-            metadata.update(_extract_monitoring_metrics(event_body))
-
-            payloads.append(
-                {
-                    "provider": "genesys_cloud",
-                    "call_id": call_id,
-                    "event_type": event_type,
-                    "speaker": record_speaker,
-                    "text": text,
-                    "sentiment": sentiment,
-                    "confidence": confidence,
-                    "status": status,
-                    "timestamp": occurred_at,
-                    "agent_id": self._extract_agent_id(event_body),
-                    "customer_id": self._extract_customer_id(event_body),
-                    "metadata": metadata,
-                }
-            )
 
-        return payloads
+            yield {
+                "provider": "genesys_cloud",
+                "call_id": call_id,
+                "event_type": event_type,
+                "speaker": record_speaker,
+                "text": text,
+                "sentiment": sentiment,
+                "confidence": confidence,
+                "status": status,
+                "timestamp": occurred_at,
+                "agent_id": agent_id,
+                "customer_id": customer_id,
+                "metadata": metadata,
+            }
 
     def _extract_call_id(self, topic: str, event_body: dict[str, Any]) -> str:
-        candidates = [
-            event_body.get("conversationId"),
-            event_body.get("conversation_id"),
-            event_body.get("id"),
-        ]
+        call_id = _first_non_empty(event_body, _CALL_ID_KEYS)
+        if call_id:
+            return call_id
 
         conversation = event_body.get("conversation")
         if isinstance(conversation, dict):
-            candidates.append(conversation.get("id"))
-            candidates.append(conversation.get("conversationId"))
-
-        for value in candidates:
-            normalized = str(value or "").strip()
-            if normalized:
-                return normalized
+            call_id = _first_non_empty(conversation, _CONVERSATION_ID_KEYS)
+            if call_id:
+                return call_id
 
-        match = re.search(r"conversations\.([a-f0-9-]{16,})", topic, flags=re.IGNORECASE)
+        match = _TOPIC_CONVERSATION_ID_RE.search(topic)
         if match:
             return match.group(1)
 
         return ""
 
+    def _extract_event_id(self, notification: dict[str, Any], event_body: dict[str, Any]) -> str:
+        metadata = notification.get("metadata")
+        if isinstance(metadata, dict):
+            event_id = _first_non_empty(metadata, _EVENT_ID_KEYS)
+            if event_id:
+                return event_id
+        return _first_non_empty(event_body, _EVENT_ID_KEYS)
+
     def _extract_event_type(self, topic: str, event_body: dict[str, Any]) -> str:
-        explicit = str(event_body.get("eventType") or event_body.get("type") or "").strip().lower()
+        explicit = _first_non_empty(event_body, _EVENT_TYPE_KEYS)
         if explicit:
-            return explicit
-        parts = [part for part in topic.split(".") if part]
-        if parts:
-            return parts[-1].lower()
-        return "transcript"
+            return explicit.lower()
+        return _topic_event_type(topic)
 
     def _extract_status(self, event_type: str, event_body: dict[str, Any]) -> str:
-        raw = str(
-            event_body.get("status")
-            or event_body.get("state")
-            or event_body.get("conversationState")
-            or ""
-        ).strip().lower()
+        raw = _first_non_empty(event_body, _STATUS_KEYS).lower()
         if raw:
-            if any(token in raw for token in ("disconnect", "terminated", "ended", "complete", "closed")):
+            if _ENDED_STATUS_RE.search(raw):
                 return "ended"
             return "active"
-        if any(token in event_type for token in ("disconnect", "terminate", "end", "complete")):
+        if _ENDED_EVENT_TYPE_RE.search(event_type):
             return "ended"
         return "active"
 
@@ -638,66 +880,43 @@ class GenesysCloudConnector:
             if parsed is not None:
                 return parsed.isoformat()
 
-        return datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
-
-    def _extract_speaker(self, event_body: dict[str, Any]) -> str:
-        for key in ("speaker", "speakerType", "participantPurpose", "purpose", "role"):
-            value = str(event_body.get(key) or "").strip().lower()
-            if value:
-                return _normalize_speaker(value)
-
-        participants = event_body.get("participants")
-        if isinstance(participants, list):
-            for participant in participants:
-                if not isinstance(participant, dict):
-                    continue
-                purpose = str(participant.get("purpose") or participant.get("participantPurpose") or "").strip()
-                state = str(participant.get("state") or "").lower()
-                if not purpose:
-                    continue
-                if state in {"connected", "alerting"}:
-                    return _normalize_speaker(purpose)
-        return ""
+        return _utc_now().isoformat()
 
-    def _extract_agent_id(self, event_body: dict[str, Any]) -> str:
-        for key in ("agentId", "agent_id", "userId"):
-            value = str(event_body.get(key) or "").strip()
-            if value:
-                return value
+    def _summarize_participants(self, event_body: dict[str, Any]) -> tuple[str, str, str]:
+        speaker = _first_non_empty(event_body, _SPEAKER_KEYS)
+        if speaker:
+            speaker = _normalize_speaker(speaker)
+        agent_id = _first_non_empty(event_body, _AGENT_ID_KEYS)
+        customer_id = _first_non_empty(event_body, _CUSTOMER_ID_KEYS)
 
         participants = event_body.get("participants")
-        if isinstance(participants, list):
-            for participant in participants:
-                if not isinstance(participant, dict):
-                    continue
-                purpose = str(participant.get("purpose") or "").lower()
-                if purpose not in {"agent", "user"}:
-                    continue
-                value = str(participant.get("userId") or participant.get("id") or "").strip()
-                if value:
-                    return value
-        return ""
-
-    def _extract_customer_id(self, event_body: dict[str, Any]) -> str:
-        for key in ("customerId", "externalContactId", "customer_id"):
-            value = str(event_body.get(key) or "").strip()
-            if value:
-                return value
+        if not isinstance(participants, list):
+            return speaker, agent_id, customer_id
 
-        participants = event_body.get("participants")
-        if isinstance(participants, list):
-            for participant in participants:
-                if not isinstance(participant, dict):
-                    continue
-                purpose = str(participant.get("purpose") or "").lower()
-                if purpose not in {"customer", "external"}:
-                    continue
-                value = str(participant.get("id") or participant.get("externalContactId") or "").strip()
-                if value:
-                    return value
-        return ""
+        # One pass fills whichever of speaker/agent/customer the event body did not provide.
+        for participant in participants:
+            if speaker and agent_id and customer_id:
+                break
+            if not isinstance(participant, dict):
+                continue
+            if not speaker:
+                purpose = _first_non_empty(participant, _PARTICIPANT_PURPOSE_KEYS)
+                if purpose and str(participant.get("state") or "").lower() in _ACTIVE_PARTICIPANT_STATES:
+                    speaker = _normalize_speaker(purpose)
+            if agent_id and customer_id:
+                continue
+            purpose = str(participant.get("purpose") or "").lower()
+            if not agent_id and purpose in _AGENT_PURPOSES:
+                agent_id = _first_non_empty(participant, _AGENT_PARTICIPANT_ID_KEYS)
+            elif not customer_id and purpose in _CUSTOMER_PURPOSES:
+                customer_id = _first_non_empty(participant, _CUSTOMER_PARTICIPANT_ID_KEYS)
+        return speaker, agent_id, customer_id
 
     def _extract_text_records(self, event_body: dict[str, Any]) -> list[dict[str, object]]:
+        # Status-only notifications carry none of the text keys.
+        if _TEXT_RECORD_KEYS.isdisjoint(event_body):
+            return []
+
         records: list[dict[str, object]] = []
 
         transcripts = event_body.get("transcripts")
@@ -705,20 +924,10 @@ class GenesysCloudConnector:
             for entry in transcripts:
                 if not isinstance(entry, dict):
                     continue
-                text = str(
-                    entry.get("text")
-                    or entry.get("transcript")
-                    or entry.get("utteranceText")
-                    or ""
-                ).strip()
+                text = _first_non_empty(entry, _TRANSCRIPT_TEXT_KEYS)
                 if not text:
                     continue
-                speaker = str(
-                    entry.get("speaker")
-                    or entry.get("participantPurpose")
-                    or entry.get("role")
-                    or ""
-                ).strip()
+                speaker = _first_non_empty(entry, _TRANSCRIPT_SPEAKER_KEYS)
                 records.append(
                     {
                         "text": text,
@@ -732,10 +941,10 @@ class GenesysCloudConnector:
             for entry in utterances:
                 if not isinstance(entry, dict):
                     continue
-                text = str(entry.get("text") or entry.get("utteranceText") or "").strip()
+                text = _first_non_empty(entry, _UTTERANCE_TEXT_KEYS)
                 if not text:
                     continue
-                speaker = str(entry.get("speaker") or entry.get("role") or "").strip()
+                speaker = _first_non_empty(entry, _UTTERANCE_SPEAKER_KEYS)
                 records.append(
                     {
                         "text": text,
@@ -744,43 +953,40 @@ class GenesysCloudConnector:
                     }
                 )
 
-        for key in ("text", "transcript", "utteranceText", "message"):
+        for key in _BODY_TEXT_KEYS:
             value = event_body.get(key)
-            if isinstance(value, str) and value.strip():
-                records.append({"text": value.strip(), "speaker": "", "source": key})
+            if isinstance(value, str):
+                text = value.strip()
+                if text:
+                    records.append({"text": text, "speaker": "", "source": key})
             elif isinstance(value, dict):
-                nested_text = str(value.get("text") or value.get("body") or "").strip()
+                nested_text = _first_non_empty(value, _NESTED_TEXT_KEYS)
                 if nested_text:
                     records.append({"text": nested_text, "speaker": "", "source": key})
 
+        if len(records) < 2:
+            return records
+
+        # Every record above already holds non-empty stripped text.
         deduped: list[dict[str, object]] = []
         seen: set[str] = set()
+        seen_add = seen.add
         for record in records:
-            text = str(record.get("text") or "").strip()
-            if not text:
-                continue
-            key = text.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append(record)
+            key = str(record["text"]).lower()
+            if key not in seen:
+                seen_add(key)
+                deduped.append(record)
         return deduped
 
     def _extract_sentiment(self, event_body: dict[str, Any]) -> float | None:
-        direct_candidates = [
-            event_body.get("sentiment"),
-            event_body.get("sentimentScore"),
-            event_body.get("overallSentiment"),
-            event_body.get("sentiment_score"),
-        ]
-        for candidate in direct_candidates:
-            parsed = _parse_sentiment(candidate)
+        for key in _SENTIMENT_KEYS:
+            parsed = _parse_sentiment(event_body.get(key))
             if parsed is not None:
                 return parsed
 
         sentiment = event_body.get("sentiment")
         if isinstance(sentiment, dict):
-            for key in ("score", "overall", "value"):
+            for key in _NESTED_SENTIMENT_KEYS:
                 parsed = _parse_sentiment(sentiment.get(key))
                 if parsed is not None:
                     return parsed
@@ -788,22 +994,17 @@ class GenesysCloudConnector:
         return None
 
     def _extract_confidence(self, event_body: dict[str, Any]) -> float | None:
-        direct_candidates = [
-            event_body.get("confidence"),
-            event_body.get("confidenceScore"),
-            event_body.get("sentimentConfidence"),
-        ]
+        for key in _CONFIDENCE_KEYS:
+            parsed = _parse_float(event_body.get(key))
+            if parsed is not None:
+                return max(0.0, min(1.0, parsed))
+
         sentiment = event_body.get("sentiment")
         if isinstance(sentiment, dict):
-            direct_candidates.extend(
-                [sentiment.get("confidence"), sentiment.get("confidenceScore")]
-            )
-
-        for candidate in direct_candidates:
-            parsed = _parse_float(candidate)
-            if parsed is None:
-                continue
-            return max(0.0, min(1.0, parsed))
+            for key in _NESTED_CONFIDENCE_KEYS:
+                parsed = _parse_float(sentiment.get(key))
+                if parsed is not None:
+                    return max(0.0, min(1.0, parsed))
         return None
 
     def _forward_payload(self, payload: dict[str, object]) -> None:
@@ -817,16 +1018,12 @@ class GenesysCloudConnector:
             )
             return
 
-        headers: dict[str, str] = {"Content-Type": "application/json"}
-        if self.config.target_ingest_token:
-            headers["X-Cloud-Token"] = self.config.target_ingest_token
-
         response = self._request(
             "POST",
             self.config.target_ingest_url,
             include_auth=False,
-            headers=headers,
-            json_body=payload,
+            headers=self._ingest_headers,
+            data=_json_dumps(payload),
             expected_status=(200,),
         )
         logger.debug(
@@ -873,15 +1070,18 @@ class GenesysCloudConnector:
         expected_status: tuple[int, ...] = (200,),
     ) -> requests.Response:
         attempts = self.config.retry_max_attempts
-        retryable_codes = {408, 429, 500, 502, 503, 504}
         last_exception: Exception | None = None
 
+        req_headers: dict[str, str] = dict(headers or {})
+        # Only (re)fetch the bearer on the first attempt and after a 401 invalidated it.
+        auth_stale = include_auth
+
         for attempt in range(1, attempts + 1):
-            req_headers: dict[str, str] = {}
-            if include_auth:
-                req_headers.update(self._auth_headers())
-            if headers:
-                req_headers.update(headers)
+            if self._stop_event.is_set():
+                raise RuntimeError(f"Request aborted, connector stopping: {method.upper()} {url}")
+            if auth_stale:
+                req_headers = {**self._auth_headers(), **(headers or {})}
+                auth_stale = False
 
             try:
                 response = self.session.request(
@@ -915,8 +1115,9 @@ class GenesysCloudConnector:
 
             if response.status_code == 401 and include_auth:
                 self._invalidate_token()
+                auth_stale = True
 
-            should_retry = response.status_code in retryable_codes and attempt < attempts
+            should_retry = response.status_code in _RETRYABLE_STATUS_CODES and attempt < attempts
             if should_retry:
                 delay = self._retry_delay(attempt)
                 logger.warning(
@@ -947,12 +1148,20 @@ class GenesysCloudConnector:
     def _invalidate_token(self) -> None:
         self._token = None
         self._token_expires_at = None
+        self._token_expires_monotonic = 0.0
 
     def _get_access_token(self) -> str:
-        if self._token and self._token_expires_at:
-            if datetime.utcnow() < (self._token_expires_at - timedelta(seconds=30)):
+        # Monotonic expiry is immune to wall-clock jumps; _token_expires_at is kept for status only.
+        if self._token and time.monotonic() < self._token_expires_monotonic:
+            return self._token
+
+        # Discovery workers share the token; only one of them should hit /oauth/token per expiry.
+        with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires_monotonic:
                 return self._token
+            return self._refresh_access_token()
 
+    def _refresh_access_token(self) -> str:
         url = f"{self.config.login_base_url}/oauth/token"
         credentials = f"{self.config.client_id}:{self.config.client_secret}".encode("utf-8")
         encoded = base64.b64encode(credentials).decode("utf-8")
@@ -976,22 +1185,21 @@ class GenesysCloudConnector:
 
         expires_in = int(payload.get("expires_in") or 3600)
         self._token = token
-        self._token_expires_at = datetime.utcnow() + timedelta(seconds=max(60, expires_in))
-        self._set_status(token_expires_at=self._token_expires_at.replace(tzinfo=timezone.utc).isoformat())
+        self._token_expires_monotonic = time.monotonic() + max(60, expires_in) - 30
+        self._token_expires_at = datetime.fromtimestamp(time.time() + max(60, expires_in), tz=timezone.utc)
+        self._set_status(token_expires_at=self._token_expires_at.isoformat())
         logger.info("genesys_oauth_token_refreshed expires_in=%s", expires_in)
         return token
 
     def _retry_delay(self, attempt: int) -> float:
-        return self.config.retry_backoff_seconds * max(1, attempt - 1)
+        # Full jitter keeps retrying connectors from re-hitting a throttled endpoint in lockstep.
+        ceiling = self.config.retry_backoff_seconds * (1 << min(attempt - 1, 6))
+        return self._retry_random.uniform(0.0, min(RETRY_BACKOFF_CAP_SECONDS, ceiling))
 
     def _sleep_with_stop(self, delay_seconds: float) -> None:
         if delay_seconds <= 0:
             return
-        end_time = time.time() + delay_seconds
-        while time.time() < end_time:
-            if self._stop_event.is_set():
-                return
-            time.sleep(0.2)
+        self._stop_event.wait(delay_seconds)
 
 
 def _normalize_base_url(url: str) -> str:
@@ -1002,6 +1210,20 @@ def _split_csv(raw: str) -> list[str]:
     return [item.strip() for item in str(raw or "").split(",") if item.strip()]
 
 
+def _discovery_page_size(max_items: int, *, filtered: bool) -> int:
+    # Without filters every entity counts toward the limit, so a small limit needs a small first page.
+    if filtered or max_items <= 0:
+        return DISCOVERY_PAGE_SIZE
+    return min(DISCOVERY_PAGE_SIZE, max(25, max_items * 2))
+
+
+def _compile_term_filter(terms: list[str]) -> re.Pattern[str] | None:
+    escaped = [re.escape(term.lower()) for term in terms if term]
+    if not escaped:
+        return None
+    return re.compile("|".join(escaped), re.IGNORECASE)
+
+
 def _flatten_notifications(payload: object) -> list[dict[str, Any]]:
     if isinstance(payload, list):
         return [item for item in payload if isinstance(item, dict)]
@@ -1013,6 +1235,36 @@ def _flatten_notifications(payload: object) -> list[dict[str, Any]]:
     return []
 
 
+def _json_dumps(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _first_non_empty(source: dict[str, Any], keys: tuple[str, ...]) -> str:
+    for key in keys:
+        value = source.get(key)
+        if value:
+            text = (value if type(value) is str else str(value)).strip()
+            if text:
+                return text
+    return ""
+
+
+@functools.lru_cache(maxsize=4096)
+def _topic_event_type(topic: str) -> str:
+    parts = [part for part in topic.split(".") if part]
+    if parts:
+        return parts[-1].lower()
+    return "transcript"
+
+
 def _normalize_speaker(value: str) -> str:
     normalized = str(value or "").strip().lower()
     if not normalized:
@@ -1027,6 +1279,13 @@ def _normalize_speaker(value: str) -> str:
 def _parse_float(value: object) -> float | None:
     if value is None:
         return None
+    if isinstance(value, float):
+        return value
+    if isinstance(value, int):
+        return float(value)
+    # Nested sentiment objects are the common miss; skip raising TypeError for them.
+    if isinstance(value, (dict, list)):
+        return None
     try:
         return float(value)
     except (TypeError, ValueError):
@@ -1041,13 +1300,7 @@ def _parse_sentiment(value: object) -> float | None:
     normalized = str(value or "").strip().lower()
     if not normalized:
         return None
-    if normalized in {"negative", "neg"}:
-        return -0.7
-    if normalized in {"neutral"}:
-        return 0.0
-    if normalized in {"positive", "pos"}:
-        return 0.7
-    return None
+    return _SENTIMENT_LABEL_SCORES.get(normalized)
 
 
 def _parse_int(value: object) -> int | None:
@@ -1075,10 +1328,14 @@ def _parse_datetime(value: object) -> datetime | None:
         text = value.strip()
         if not text:
             return None
+        # Genesys sends ISO-8601; the C parser handles that and dateutil covers the rest.
         try:
-            parsed = date_parser.parse(text)
-        except (ValueError, OverflowError):
-            return None
+            parsed = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+        except ValueError:
+            try:
+                parsed = date_parser.parse(text)
+            except (ValueError, OverflowError):
+                return None
         if parsed.tzinfo is None:
             return parsed.replace(tzinfo=timezone.utc)
         return parsed.astimezone(timezone.utc)
@@ -1101,11 +1358,18 @@ def _extract_monitoring_metrics(event_body: dict[str, Any]) -> dict[str, Any]:
 
 
 def _response_snippet(text: str, max_len: int = 240) -> str:
-    compact = " ".join(str(text or "").split())
-    if len(compact) <= max_len:
+    # Error pages can be megabytes of HTML; only the head can survive the cut anyway.
+    raw = str(text or "")
+    head_len = max_len * 4
+    compact = " ".join(raw[:head_len].split())
+    if len(compact) <= max_len and len(raw) <= head_len:
         return compact
     return compact[: max_len - 3] + "..."
 
 
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 def _utc_iso_now() -> str:
-    return datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+    return datetime.now(timezone.utc).isoformat()
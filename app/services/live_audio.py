@@ -1,21 +1,79 @@
 from __future__ import annotations
 
-import io
 import json
 import logging
+import os
 import re
+import shutil
+import string
+import struct
 import threading
-import wave
-from datetime import datetime
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
 
+LIVE_AUDIO_FLUSH_SECONDS = 1.0
+LIVE_AUDIO_OPEN_CALLS = 64
+LIVE_AUDIO_COMPACT_MIN_BYTES = 4 * 1024 * 1024
+
+_SAFE_CALL_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_.-")
+_SAFE_CALL_ID_TABLE = {code: (chr(code) if chr(code) in _SAFE_CALL_ID_CHARS else "_") for code in range(128)}
+_UNSAFE_CALL_ID_RE = re.compile(r"[^A-Za-z0-9_.-]")
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
 
 def _utcnow_iso() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+    # Aware now() avoids the deprecated utcnow(); swap its +00:00 suffix for the Z clients expect.
+    return datetime.now(timezone.utc).isoformat()[:-6] + "Z"
+
+
+def _json_dumps(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _wav_header(data_bytes: int, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    block_align = channels * sample_width
+    return _WAV_HEADER.pack(
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        data_bytes,
+    )
+
+
+def _close_files(files: tuple[BinaryIO, ...]) -> None:
+    for handle in files:
+        try:
+            handle.close()
+        except OSError:
+            logger.debug("live_audio_file_close_failed name=%s", getattr(handle, "name", ""))
 
 
 class LiveAudioBufferService:
@@ -31,6 +89,10 @@ class LiveAudioBufferService:
         self.window_seconds = max(30, int(window_seconds))
         self.max_chunk_bytes = max(8_192, int(max_chunk_bytes))
         self._lock = threading.Lock()
+        self._open_files: OrderedDict[str, tuple[BinaryIO, BinaryIO]] = OrderedDict()
+        self._states: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._flusher: threading.Thread | None = None
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
     def append_pcm_chunk(
@@ -60,75 +122,65 @@ class LiveAudioBufferService:
         with self._lock:
             call_dir = self.base_dir / safe_call_id
             call_dir.mkdir(parents=True, exist_ok=True)
-            state_path = call_dir / "state.json"
-            state = self._load_state(state_path, call_id)
+            state = self._owned_state(safe_call_id, call_dir, call_id)
 
             if self._audio_format_changed(state, sample_rate, channels, sample_width):
-                self._reset_call_dir(call_dir)
+                self._reset_call_dir(safe_call_id, call_dir)
                 state = self._new_state(call_id, sample_rate, channels, sample_width)
+                self._states[safe_call_id] = state
 
             seq = int(state.get("next_seq") or 1)
             persisted_chunk_id = (chunk_id or f"{int(timestamp.timestamp() * 1000)}_{seq}").strip()
-            chunk_name = f"{seq:09d}_{persisted_chunk_id}.pcm"
-            chunk_path = call_dir / chunk_name
-            chunk_path.write_bytes(pcm_bytes)
+            audio_file, journal_file = self._call_files(safe_call_id, call_dir)
+            # The handle is opened in append mode, so tell() is the true end of audio.pcm.
+            offset = audio_file.tell()
+            audio_file.write(pcm_bytes)
 
             bytes_per_sample = channels * sample_width
             sample_count = max(1, len(pcm_bytes) // bytes_per_sample)
             chunk_meta = {
                 "id": persisted_chunk_id,
-                "file": chunk_name,
+                "offset": offset,
                 "samples": sample_count,
                 "bytes": len(pcm_bytes),
                 "occurred_at": timestamp.isoformat() + "Z",
             }
-            chunks = list(state.get("chunks") or [])
-            chunks.append(chunk_meta)
-
-            max_samples = self.window_seconds * sample_rate
-            total_samples = int(state.get("total_samples") or 0) + sample_count
-            while chunks and total_samples > max_samples and len(chunks) > 1:
-                dropped = chunks.pop(0)
-                total_samples -= int(dropped.get("samples") or 0)
-                dropped_file = call_dir / str(dropped.get("file") or "")
-                try:
-                    if dropped_file.exists():
-                        dropped_file.unlink()
-                except OSError:
-                    logger.debug("live_audio_chunk_cleanup_failed path=%s", dropped_file)
-
-            state["chunks"] = chunks
-            state["total_samples"] = max(0, total_samples)
-            state["next_seq"] = seq + 1
             state["sample_rate"] = sample_rate
             state["channels"] = channels
             state["sample_width"] = sample_width
-            state["updated_at"] = _utcnow_iso()
-            state["last_chunk_id"] = persisted_chunk_id
-            state_path.write_text(json.dumps(state), encoding="utf-8")
+            updated_at = _utcnow_iso()
+            self._apply_chunk(state, seq, chunk_meta, updated_at)
+
+            chunks = state["chunks"]
+            live_start = int(chunks[0].get("offset") or 0)
+            if live_start >= max(LIVE_AUDIO_COMPACT_MIN_BYTES, offset + len(pcm_bytes) - live_start):
+                self._compact_audio(safe_call_id, call_dir, state)
+            elif seq == 1:
+                self._write_checkpoint(safe_call_id, call_dir, state)
+            else:
+                # The journal keeps other processes' readers current; the flusher checkpoints it away.
+                journal_file.write(
+                    _json_dumps({"seq": seq, "updated_at": updated_at, "chunk": chunk_meta}) + b"\n"
+                )
+                self._dirty.add(safe_call_id)
+                self._ensure_flusher()
 
             return self._state_summary(call_id, state)
 
     def get_state(self, call_id: str) -> dict[str, Any]:
         safe_call_id = self._safe_call_id(call_id)
         with self._lock:
-            state_path = self.base_dir / safe_call_id / "state.json"
-            if not state_path.exists():
-                return self._state_summary(call_id, None)
-            state = self._load_state(state_path, call_id)
+            state = self._read_state(safe_call_id, call_id)
             return self._state_summary(call_id, state)
 
     def get_wav_bytes(self, call_id: str, max_seconds: int | None = None) -> bytes | None:
         safe_call_id = self._safe_call_id(call_id)
         with self._lock:
             call_dir = self.base_dir / safe_call_id
-            state_path = call_dir / "state.json"
-            if not state_path.exists():
-                return None
-            state = self._load_state(state_path, call_id)
-            chunks = list(state.get("chunks") or [])
-            if not chunks:
+            state = self._read_state(safe_call_id, call_id)
+            if not state or not state.get("chunks"):
                 return None
+            chunks = state["chunks"]
 
             sample_rate = int(state.get("sample_rate") or 0)
             channels = int(state.get("channels") or 0)
@@ -136,36 +188,140 @@ class LiveAudioBufferService:
             if sample_rate <= 0 or channels <= 0 or sample_width <= 0:
                 return None
 
-            pcm_parts: list[bytes] = []
-            for chunk in chunks:
-                file_name = str(chunk.get("file") or "")
-                if not file_name:
-                    continue
-                path = call_dir / file_name
-                if not path.exists():
+            start = int(chunks[0].get("offset") or 0)
+            end = int(chunks[-1].get("offset") or 0) + int(chunks[-1].get("bytes") or 0)
+            bytes_per_second = sample_rate * channels * sample_width
+            if max_seconds and max_seconds > 0:
+                # Seek straight to the requested tail instead of reading the whole window.
+                start = max(start, end - bytes_per_second * int(max_seconds))
+            audio_path = call_dir / "audio.pcm"
+            try:
+                with audio_path.open("rb") as audio_file:
+                    audio_file.seek(start)
+                    pcm_payload = audio_file.read(max(0, end - start))
+            except OSError:
+                logger.debug("live_audio_read_failed path=%s", audio_path)
+                return None
+
+            if not pcm_payload:
+                return None
+
+            return _wav_header(len(pcm_payload), sample_rate, channels, sample_width) + pcm_payload
+
+    def flush(self) -> None:
+        with self._lock:
+            for safe_call_id in list(self._dirty):
+                state = self._states.get(safe_call_id)
+                if state is None:
+                    self._dirty.discard(safe_call_id)
                     continue
                 try:
-                    pcm_parts.append(path.read_bytes())
+                    self._write_checkpoint(safe_call_id, self.base_dir / safe_call_id, state)
                 except OSError:
-                    logger.debug("live_audio_chunk_read_failed path=%s", path)
+                    logger.warning("live_audio_checkpoint_failed call_id=%s", safe_call_id, exc_info=True)
 
-            if not pcm_parts:
-                return None
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="live-audio-flush", daemon=True)
+        self._flusher.start()
 
-            pcm_payload = b"".join(pcm_parts)
-            bytes_per_second = sample_rate * channels * sample_width
-            if max_seconds and max_seconds > 0 and bytes_per_second > 0:
-                max_bytes = bytes_per_second * int(max_seconds)
-                if len(pcm_payload) > max_bytes:
-                    pcm_payload = pcm_payload[-max_bytes:]
-
-            buffer = io.BytesIO()
-            with wave.open(buffer, "wb") as wav_file:
-                wav_file.setnchannels(channels)
-                wav_file.setsampwidth(sample_width)
-                wav_file.setframerate(sample_rate)
-                wav_file.writeframes(pcm_payload)
-            return buffer.getvalue()
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(LIVE_AUDIO_FLUSH_SECONDS)
+            self.flush()
+
+    def _owned_state(self, safe_call_id: str, call_dir: Path, call_id: str) -> dict[str, Any]:
+        state = self._states.get(safe_call_id)
+        if state is not None:
+            self._states.move_to_end(safe_call_id)
+            return state
+        while len(self._states) >= LIVE_AUDIO_OPEN_CALLS:
+            stale_call_id, stale_state = self._states.popitem(last=False)
+            if stale_call_id in self._dirty:
+                self._write_checkpoint(stale_call_id, self.base_dir / stale_call_id, stale_state)
+            self._release_call_files(stale_call_id)
+        state = self._load_state(call_dir, call_id, drop_legacy=True)
+        self._states[safe_call_id] = state
+        return state
+
+    def _read_state(self, safe_call_id: str, call_id: str) -> dict[str, Any] | None:
+        state = self._states.get(safe_call_id)
+        if state is not None:
+            return state
+        # Calls fed by another worker process are read straight from disk, never cached.
+        call_dir = self.base_dir / safe_call_id
+        if not (call_dir / "state.json").exists():
+            return None
+        return self._load_state(call_dir, call_id)
+
+    def _apply_chunk(
+        self,
+        state: dict[str, Any],
+        seq: int,
+        chunk_meta: dict[str, Any],
+        updated_at: str,
+    ) -> None:
+        chunks = state["chunks"]
+        chunks.append(chunk_meta)
+
+        # Eviction only moves the live start forward; audio.pcm is trimmed by _compact_audio.
+        max_samples = self.window_seconds * int(state.get("sample_rate") or 0)
+        total_samples = int(state.get("total_samples") or 0) + int(chunk_meta.get("samples") or 0)
+        while chunks and total_samples > max_samples and len(chunks) > 1:
+            dropped = chunks.popleft()
+            total_samples -= int(dropped.get("samples") or 0)
+
+        state["total_samples"] = max(0, total_samples)
+        state["next_seq"] = seq + 1
+        state["updated_at"] = updated_at
+        state["last_chunk_id"] = str(chunk_meta.get("id") or "")
+
+    def _call_files(self, safe_call_id: str, call_dir: Path) -> tuple[BinaryIO, BinaryIO]:
+        files = self._open_files.get(safe_call_id)
+        if files is not None:
+            self._open_files.move_to_end(safe_call_id)
+            return files
+        while len(self._open_files) >= LIVE_AUDIO_OPEN_CALLS:
+            _, stale = self._open_files.popitem(last=False)
+            _close_files(stale)
+        # Unbuffered so get_wav_bytes always sees every byte that append_pcm_chunk wrote.
+        files = (
+            (call_dir / "audio.pcm").open("ab", buffering=0),
+            (call_dir / "chunks.jsonl").open("ab", buffering=0),
+        )
+        self._open_files[safe_call_id] = files
+        return files
+
+    def _release_call_files(self, safe_call_id: str) -> None:
+        files = self._open_files.pop(safe_call_id, None)
+        if files is not None:
+            _close_files(files)
+
+    def _write_checkpoint(self, safe_call_id: str, call_dir: Path, state: dict[str, Any]) -> None:
+        _, journal_file = self._call_files(safe_call_id, call_dir)
+        state["checkpoint_seq"] = int(state.get("next_seq") or 1)
+        state_path = call_dir / "state.json"
+        tmp_path = call_dir / "state.json.tmp"
+        tmp_path.write_bytes(_json_dumps({**state, "chunks": list(state["chunks"])}))
+        os.replace(tmp_path, state_path)
+        # Journal entries are now covered by the checkpoint; replay skips them by seq anyway.
+        journal_file.truncate(0)
+        self._dirty.discard(safe_call_id)
+
+    def _compact_audio(self, safe_call_id: str, call_dir: Path, state: dict[str, Any]) -> None:
+        chunks = state["chunks"]
+        live_start = int(chunks[0].get("offset") or 0)
+        audio_path = call_dir / "audio.pcm"
+        tmp_path = call_dir / "audio.pcm.tmp"
+        self._release_call_files(safe_call_id)
+        with audio_path.open("rb") as source, tmp_path.open("wb") as target:
+            source.seek(live_start)
+            shutil.copyfileobj(source, target)
+        os.replace(tmp_path, audio_path)
+        for chunk in chunks:
+            chunk["offset"] = int(chunk.get("offset") or 0) - live_start
+        self._write_checkpoint(safe_call_id, call_dir, state)
 
     def _audio_format_changed(
         self,
@@ -182,26 +338,39 @@ class LiveAudioBufferService:
             or int(state.get("sample_width") or 0) != sample_width
         )
 
-    def _reset_call_dir(self, call_dir: Path) -> None:
+    def _reset_call_dir(self, safe_call_id: str, call_dir: Path) -> None:
+        self._release_call_files(safe_call_id)
+        self._dirty.discard(safe_call_id)
         for path in call_dir.glob("*.pcm"):
             try:
                 path.unlink()
             except OSError:
                 logger.debug("live_audio_chunk_delete_failed path=%s", path)
-        state_path = call_dir / "state.json"
-        try:
-            if state_path.exists():
-                state_path.unlink()
-        except OSError:
-            logger.debug("live_audio_state_delete_failed path=%s", state_path)
+        for name in ("state.json", "chunks.jsonl"):
+            state_path = call_dir / name
+            try:
+                if state_path.exists():
+                    state_path.unlink()
+            except OSError:
+                logger.debug("live_audio_state_delete_failed path=%s", state_path)
 
-    def _load_state(self, state_path: Path, call_id: str) -> dict[str, Any]:
+    def _load_state(self, call_dir: Path, call_id: str, *, drop_legacy: bool = False) -> dict[str, Any]:
         try:
-            state = json.loads(state_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+            state = _json_loads((call_dir / "state.json").read_bytes())
+        except (OSError, ValueError):
             state = {}
         if not isinstance(state, dict):
             state = {}
+        # Buffers written by the old one-file-per-chunk layout carry no offsets; start over. Only
+        # the writer drops their "<seq>_<chunk_id>.pcm" files: a read-only lookup may be looking
+        # at a call an old-layout worker is still feeding during a rolling deploy.
+        if any("offset" not in chunk for chunk in state.get("chunks") or []):
+            state = {}
+            for path in call_dir.glob("*_*.pcm") if drop_legacy else ():
+                try:
+                    path.unlink()
+                except OSError:
+                    logger.debug("live_audio_chunk_delete_failed path=%s", path)
 
         sample_rate = int(state.get("sample_rate") or 0)
         channels = int(state.get("channels") or 0)
@@ -211,13 +380,35 @@ class LiveAudioBufferService:
         else:
             state.setdefault("call_id", call_id)
             state.setdefault("window_seconds", self.window_seconds)
-            state.setdefault("chunks", [])
+            chunks = state.get("chunks")
+            state["chunks"] = deque(chunks if isinstance(chunks, list) else ())
             state.setdefault("total_samples", 0)
             state.setdefault("next_seq", 1)
             state.setdefault("updated_at", _utcnow_iso())
             state.setdefault("last_chunk_id", "")
+            state.setdefault("checkpoint_seq", 0)
+            self._replay_journal(call_dir, state)
         return state
 
+    def _replay_journal(self, call_dir: Path, state: dict[str, Any]) -> None:
+        try:
+            lines = (call_dir / "chunks.jsonl").read_bytes().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                entry = _json_loads(line)
+            except ValueError:
+                # A torn trailing line from an interrupted append; nothing after it is valid.
+                break
+            if not isinstance(entry, dict):
+                continue
+            seq = int(entry.get("seq") or 0)
+            chunk_meta = entry.get("chunk")
+            if seq < int(state.get("next_seq") or 1) or not isinstance(chunk_meta, dict):
+                continue
+            self._apply_chunk(state, seq, chunk_meta, str(entry.get("updated_at") or ""))
+
     def _new_state(
         self,
         call_id: str,
@@ -231,11 +422,12 @@ class LiveAudioBufferService:
             "sample_rate": sample_rate,
             "channels": channels,
             "sample_width": sample_width,
-            "chunks": [],
+            "chunks": deque(),
             "total_samples": 0,
             "next_seq": 1,
             "updated_at": _utcnow_iso(),
             "last_chunk_id": "",
+            "checkpoint_seq": 0,
         }
 
     def _state_summary(self, call_id: str, state: dict[str, Any] | None) -> dict[str, Any]:
@@ -256,7 +448,7 @@ class LiveAudioBufferService:
         sample_rate = int(state.get("sample_rate") or 0)
         total_samples = int(state.get("total_samples") or 0)
         duration_seconds = round(total_samples / sample_rate, 3) if sample_rate > 0 else 0.0
-        chunks = list(state.get("chunks") or [])
+        chunks = state.get("chunks") or []
         return {
             "call_id": str(state.get("call_id") or call_id),
             "available": bool(chunks),
@@ -271,6 +463,10 @@ class LiveAudioBufferService:
         }
 
     def _safe_call_id(self, call_id: str) -> str:
-        cleaned = re.sub(r"[^A-Za-z0-9_.-]", "_", str(call_id or "").strip())
+        cleaned = str(call_id or "").strip()
+        if cleaned.isascii():
+            cleaned = cleaned.translate(_SAFE_CALL_ID_TABLE)
+        else:
+            cleaned = _UNSAFE_CALL_ID_RE.sub("_", cleaned)
         cleaned = cleaned.strip("._")
         return cleaned[:96] or "call"
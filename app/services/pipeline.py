@@ -1,22 +1,129 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import io
+import itertools
 import json
 import logging
 import math
+import os
 import re
+import subprocess
+import threading
+import time
 import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 
 from pydub import AudioSegment
+from pydub.utils import get_prober_name
 
 from app.config import settings
 from app.services.sarvam_client import SarvamService
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+LLM_CACHE_SWEEP_INTERVAL_SECONDS = 3600.0
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_REPEATED_WORD_RE = re.compile(r"\b(\w+)(\s+\1\b)+", re.IGNORECASE)
+_NAME_PATTERNS = tuple(
+    re.compile(cue + r"\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?")
+    for cue in (
+        r"\bmy name is",
+        r"\bthis is",
+        r"\bi am",
+        r"\bi'm",
+        r"\bim",
+        r"\byou'?re speaking with",
+        r"\bspeaking with",
+    )
+)
+_NAME_CUE_RE = re.compile(r"\b(?:my name is|this is|i am|i'm|im|you'?re speaking with|speaking with)\s")
+_AGENT_CUES = frozenset(
+    (
+        "thank you for calling",
+        "how can i help",
+        "how may i help",
+        "i will",
+        "i can help",
+        "let me",
+        "ticket",
+        "reference number",
+        "policy",
+        "account number",
+        "apologies",
+        "sorry for the inconvenience",
+        "our company",
+    )
+)
+_CUSTOMER_CUES = frozenset(
+    (
+        "i need",
+        "i want",
+        "my issue",
+        "my problem",
+        "refund",
+        "complaint",
+        "not working",
+        "charged",
+        "why",
+        "when will",
+        "i was",
+        "i paid",
+    )
+)
+# One lookahead scan finds the longest cue at each offset; each cue also carries the cues it
+# contains, so every distinct cue present in an utterance still scores exactly once.
+_ROLE_CUE_CONTAINS = {
+    cue: frozenset(other for other in _AGENT_CUES | _CUSTOMER_CUES if other in cue)
+    for cue in _AGENT_CUES | _CUSTOMER_CUES
+}
+_ROLE_CUE_RE = re.compile(
+    "(?=({}))".format("|".join(re.escape(cue) for cue in sorted(_ROLE_CUE_CONTAINS, key=len, reverse=True)))
+)
+_LLM_CACHE_SWEEP_LOCK = threading.Lock()
+_llm_cache_next_sweep = 0.0
+_SYSTEM_PROMPT = "You are a precise call analytics assistant."
+_ANALYSIS_INSTRUCTIONS = (
+    "Analyze the transcript and speaker stats. "
+    "Return ONLY JSON with keys: summary, sentiment, topics, action_items, resolution, "
+    "qa_pairs, speaker_roles, speaker_roles_confidence, compliance_flags. "
+    "summary should include short and bullets. "
+    "sentiment should include overall, customer, agent, confidence (0-1). "
+    "resolution should include status and next_steps. "
+    "qa_pairs should be an array of {question, answer}. "
+    "speaker_roles should map speaker_id to Agent, Customer, or Other. "
+    "speaker_roles_confidence should map speaker_id to confidence 0-1. "
+    "speaker_names should map speaker_id to a name string or null. "
+    "If unsure, use null or empty arrays."
+)
+_FORCE_JSON_INSTRUCTIONS = (
+    "Return ONLY JSON with keys: summary, sentiment, topics, action_items, resolution, "
+    "qa_pairs, speaker_roles, speaker_roles_confidence, compliance_flags. "
+    "summary should include short and bullets. "
+    "sentiment should include overall, customer, agent, confidence (0-1). "
+    "resolution should include status and next_steps. "
+    "qa_pairs should be an array of {question, answer}. "
+    "speaker_roles should map speaker_id to Agent, Customer, or Other. "
+    "speaker_roles_confidence should map speaker_id to confidence 0-1."
+)
+_RERUN_INSTRUCTIONS = (
+    "Provide ONLY JSON with keys: sentiment, speaker_roles, speaker_roles_confidence. "
+    "sentiment should include overall, customer, agent, confidence (0-1). "
+    "speaker_roles should map speaker_id to Agent, Customer, or Other. "
+    "speaker_roles_confidence should map speaker_id to confidence 0-1."
+)
+
 
 @dataclass
 class PipelineOutput:
@@ -50,50 +157,84 @@ class CallAnalyticsPipeline:
         stt_output_dir = output_dir / "stt"
         stt_output_dir.mkdir(parents=True, exist_ok=True)
 
+        ns_cls = _load_noise_suppression() if settings.enable_noise_suppression else None
+        # When noise suppression will run, chunks are written in its input format so they are
+        # decoded once; otherwise they keep the source format for STT.
         chunk_paths, duration_seconds, chunk_durations = _chunk_audio(
-            audio_path, output_dir / "chunks", settings.chunk_minutes
+            audio_path,
+            output_dir / "chunks",
+            settings.chunk_minutes,
+            settings.noise_sample_rate if ns_cls is not None else None,
         )
-        if settings.enable_noise_suppression:
-            chunk_paths = _apply_noise_suppression(chunk_paths, output_dir / "denoise")
+        if ns_cls is not None:
+            chunk_paths = _apply_noise_suppression(chunk_paths, output_dir / "denoise", ns_cls)
 
         total_chunks = max(1, len(chunk_paths))
         if on_progress:
             on_progress("chunking_complete", 5, {"chunks": total_chunks})
 
-        diarized_entries: list[dict[str, Any]] = []
-        for index, chunk_path in enumerate(chunk_paths):
-            if on_progress:
-                on_progress(
-                    "transcription_start",
-                    10 + (index / total_chunks) * 60,
-                    {"chunk": index + 1, "total_chunks": total_chunks},
+        # STT jobs are network-bound, so chunk batches are transcribed concurrently and merged in order.
+        batch_size = settings.stt_batch_size if settings.stt_batch_size > 0 else total_chunks
+        batches = [
+            list(range(start, min(start + batch_size, total_chunks)))
+            for start in range(0, total_chunks, batch_size)
+        ]
+        chunk_entries: list[list[dict[str, Any]]] = [[] for _ in chunk_paths]
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(settings.stt_concurrency, len(batches))),
+            thread_name_prefix="stt-chunk",
+        )
+        try:
+            futures = {}
+            for batch_number, batch in enumerate(batches, start=1):
+                if on_progress:
+                    for index in batch:
+                        on_progress(
+                            "transcription_start",
+                            10,
+                            {"chunk": index + 1, "total_chunks": total_chunks},
+                        )
+                if len(batch) == 1:
+                    batch_output_dir = stt_output_dir / f"chunk_{batch[0] + 1:02d}"
+                else:
+                    batch_output_dir = stt_output_dir / f"batch_{batch_number:02d}"
+                future = executor.submit(
+                    self._transcribe_batch,
+                    [chunk_paths[index] for index in batch],
+                    batch_output_dir,
+                    stt_model,
+                    language_code,
+                    with_diarization,
+                    num_speakers,
+                    prompt,
                 )
-            chunk_output_dir = stt_output_dir / f"chunk_{index + 1:02d}"
-            self.sarvam.run_batch_transcription(
-                file_paths=[chunk_path],
-                model=stt_model,
-                language_code=language_code,
-                with_diarization=with_diarization,
-                num_speakers=num_speakers,
-                prompt=prompt,
-                output_dir=chunk_output_dir,
-            )
-            chunk_entries = _load_diarized_entries(chunk_output_dir)
+                futures[future] = batch
+            completed = 0
+            for future in as_completed(futures):
+                batch = futures[future]
+                for index, entries in zip(batch, future.result()):
+                    chunk_entries[index] = entries
+                    completed += 1
+                    if on_progress:
+                        on_progress(
+                            "transcription_progress",
+                            10 + (completed / total_chunks) * 60,
+                            {"chunk": index + 1, "total_chunks": total_chunks},
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        chunk_offsets = list(itertools.accumulate(chunk_durations, initial=0))
+        diarized_entries: list[dict[str, Any]] = []
+        for index, entries in enumerate(chunk_entries):
             diarized_entries.extend(
                 _offset_entries(
-                    chunk_entries,
-                    offset_seconds=sum(chunk_durations[:index]),
+                    entries,
+                    offset_seconds=chunk_offsets[index],
                     prefix=f"chunk{index + 1}_",
                 )
             )
-            if on_progress:
-                on_progress(
-                    "transcription_progress",
-                    10 + ((index + 1) / total_chunks) * 60,
-                    {"chunk": index + 1, "total_chunks": total_chunks},
-                )
 
-        transcript_text = _format_transcript(diarized_entries)
         cleaned_entries = (
             _cleanup_entries(diarized_entries)
             if settings.enable_pre_llm_cleanup
@@ -105,18 +246,16 @@ class CallAnalyticsPipeline:
         transcript_json_path = output_dir / "transcript.json"
         transcript_text_path = output_dir / "transcript.txt"
 
-        transcript_json_path.write_text(
-            json.dumps(
+        transcript_json_path.write_bytes(
+            _json_dumps(
                 {
-                    "generated_at": datetime.utcnow().isoformat() + "Z",
+                    "generated_at": _utcnow_iso(),
                     "entries": diarized_entries,
                     "speaker_stats": speaker_stats,
-                },
-                indent=2,
-            ),
-            encoding="utf-8",
+                }
+            )
         )
-        transcript_text_path.write_text(transcript_text, encoding="utf-8")
+        _write_transcript(transcript_text_path, diarized_entries)
         (output_dir / "analysis_input.txt").write_text(
             cleaned_transcript_text, encoding="utf-8"
         )
@@ -146,18 +285,9 @@ class CallAnalyticsPipeline:
         summary_json_path = output_dir / "summary.json"
         raw_llm_path = output_dir / "analysis_raw.txt"
 
-        analysis_json_path.write_text(
-            json.dumps(bundle, indent=2),
-            encoding="utf-8",
-        )
-        qa_json_path.write_text(
-            json.dumps(bundle.get("qa_pairs", []), indent=2),
-            encoding="utf-8",
-        )
-        summary_json_path.write_text(
-            json.dumps(bundle.get("summary", {}), indent=2),
-            encoding="utf-8",
-        )
+        analysis_json_path.write_bytes(_json_dumps(bundle))
+        qa_json_path.write_bytes(_json_dumps(bundle.get("qa_pairs", [])))
+        summary_json_path.write_bytes(_json_dumps(bundle.get("summary", {})))
         raw_llm_path.write_text(raw_llm_text, encoding="utf-8")
 
         return PipelineOutput(
@@ -170,9 +300,142 @@ class CallAnalyticsPipeline:
             duration_seconds=duration_seconds,
         )
 
+    def _transcribe_batch(
+        self,
+        batch_paths: list[Path],
+        batch_output_dir: Path,
+        stt_model: str,
+        language_code: str,
+        with_diarization: bool,
+        num_speakers: int | None,
+        prompt: str | None,
+    ) -> list[list[dict[str, Any]]]:
+        self.sarvam.run_batch_transcription(
+            file_paths=batch_paths,
+            model=stt_model,
+            language_code=language_code,
+            with_diarization=with_diarization,
+            num_speakers=num_speakers,
+            prompt=prompt,
+            output_dir=batch_output_dir,
+        )
+        json_files = sorted(batch_output_dir.glob("*.json"))
+        if len(batch_paths) == 1:
+            return [_load_diarized_files(json_files)]
+        # Outputs are named after their input file ("chunk_01.json" or "chunk_01.wav.json").
+        files_by_chunk: dict[str, list[Path]] = {}
+        for json_file in json_files:
+            files_by_chunk.setdefault(json_file.stem, []).append(json_file)
+        batch_entries: list[list[dict[str, Any]]] = []
+        for chunk_path in batch_paths:
+            chunk_files = files_by_chunk.get(chunk_path.stem) or files_by_chunk.get(chunk_path.name)
+            if not chunk_files:
+                logger.warning(
+                    "No STT output found for %s in %s; transcribing it on its own",
+                    chunk_path.name,
+                    batch_output_dir,
+                )
+                batch_entries.extend(
+                    self._transcribe_batch(
+                        [chunk_path],
+                        batch_output_dir / chunk_path.stem,
+                        stt_model,
+                        language_code,
+                        with_diarization,
+                        num_speakers,
+                        prompt,
+                    )
+                )
+                continue
+            batch_entries.append(_load_diarized_files(chunk_files))
+        return batch_entries
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()[:-6] + "Z"
+
 
 def _chunk_audio(
-    audio_path: Path, chunk_dir: Path, chunk_minutes: int
+    audio_path: Path, chunk_dir: Path, chunk_minutes: int, target_sample_rate: int | None = None
+) -> tuple[list[Path], float | None, list[float]]:
+    duration_seconds = _probe_duration(audio_path)
+    if duration_seconds is None:
+        return _chunk_audio_in_memory(audio_path, chunk_dir, chunk_minutes, target_sample_rate)
+
+    chunk_seconds = chunk_minutes * 60
+    if duration_seconds <= chunk_seconds:
+        return [audio_path], duration_seconds, [duration_seconds]
+
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    for stale_path in chunk_dir.glob("chunk_*.wav"):
+        stale_path.unlink()
+    # ffmpeg's segment muxer streams the input once; nothing holds the full waveform in memory.
+    command = [
+        AudioSegment.converter,
+        "-v",
+        "error",
+        "-nostdin",
+        "-y",
+        "-i",
+        str(audio_path),
+        "-vn",
+        "-f",
+        "segment",
+        "-segment_time",
+        str(chunk_seconds),
+        "-segment_start_number",
+        "1",
+        "-c:a",
+        "pcm_s16le",
+    ]
+    if target_sample_rate:
+        command += ["-ac", "1", "-ar", str(target_sample_rate)]
+    command.append(str(chunk_dir / "chunk_%02d.wav"))
+    try:
+        subprocess.run(command, check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        logger.warning("ffmpeg segmenting failed for %s, falling back to pydub: %s", audio_path, exc)
+        return _chunk_audio_in_memory(audio_path, chunk_dir, chunk_minutes, target_sample_rate)
+
+    chunk_paths = sorted(chunk_dir.glob("chunk_*.wav"), key=lambda path: int(path.stem[6:]))
+    chunk_durations = [
+        _wav_duration(path, min(float(chunk_seconds), duration_seconds - index * chunk_seconds))
+        for index, path in enumerate(chunk_paths)
+    ]
+    return chunk_paths, duration_seconds, chunk_durations
+
+
+def _probe_duration(audio_path: Path) -> float | None:
+    command = [
+        get_prober_name(),
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "csv=p=0",
+        str(audio_path),
+    ]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+def _wav_duration(path: Path, expected_seconds: float) -> float:
+    try:
+        with wave.open(str(path), "rb") as reader:
+            return reader.getnframes() / reader.getframerate()
+    except (OSError, EOFError, wave.Error, ZeroDivisionError):
+        # The wave module rejects WAVE_FORMAT_EXTENSIBLE headers (>2 channels or >48 kHz);
+        # a 0.0 here would collapse every later chunk offset onto the previous one.
+        probed = _probe_duration(path)
+        return probed if probed is not None else max(0.0, expected_seconds)
+
+
+def _chunk_audio_in_memory(
+    audio_path: Path, chunk_dir: Path, chunk_minutes: int, target_sample_rate: int | None = None
 ) -> tuple[list[Path], float | None, list[float]]:
     try:
         audio = AudioSegment.from_file(audio_path)
@@ -186,6 +449,8 @@ def _chunk_audio(
         return [audio_path], duration_seconds, [duration_seconds]
 
     chunk_dir.mkdir(parents=True, exist_ok=True)
+    if target_sample_rate:
+        audio = audio.set_channels(1).set_sample_width(2).set_frame_rate(target_sample_rate)
     chunk_paths: list[Path] = []
     chunk_durations: list[float] = []
 
@@ -202,30 +467,95 @@ def _chunk_audio(
     return chunk_paths, duration_seconds, chunk_durations
 
 
-def _apply_noise_suppression(chunk_paths: list[Path], work_dir: Path) -> list[Path]:
+def _load_noise_suppression() -> type | None:
     try:
         from speexdsp_ns import NoiseSuppression
-    except ImportError as exc:
+    except ImportError:
         logger.warning(
             "SpeexDSP noise suppression requested but speexdsp_ns is not available. "
             "Skipping noise suppression."
         )
-        return chunk_paths
+        return None
+    return NoiseSuppression
 
+
+def _apply_noise_suppression(chunk_paths: list[Path], work_dir: Path, ns_cls: type) -> list[Path]:
     work_dir.mkdir(parents=True, exist_ok=True)
     processed_paths: list[Path] = []
 
     for index, chunk_path in enumerate(chunk_paths):
-        wav_path = work_dir / f"{chunk_path.stem}_mono16k.wav"
         ns_path = work_dir / f"{chunk_path.stem}_ns.wav"
-        _ensure_pcm_wav(chunk_path, wav_path, settings.noise_sample_rate)
-        _run_speexdsp_ns(wav_path, ns_path, settings.noise_frame_size, NoiseSuppression)
+        _denoise_chunk(
+            chunk_path,
+            ns_path,
+            settings.noise_sample_rate,
+            settings.noise_frame_size,
+            ns_cls,
+        )
         processed_paths.append(ns_path)
 
     return processed_paths
 
 
-def _ensure_pcm_wav(source_path: Path, target_path: Path, sample_rate: int) -> None:
+def _denoise_chunk(
+    source_path: Path, output_path: Path, sample_rate: int, frame_size: int, ns_cls: type
+) -> None:
+    if _is_ns_ready_wav(source_path, sample_rate):
+        # Chunks cut at the target format feed SpeexDSP directly, without a second decode.
+        with wave.open(str(source_path), "rb") as reader:
+            readframes = reader.readframes
+            _run_speexdsp_ns(
+                lambda size: readframes(size // 2), output_path, sample_rate, frame_size, ns_cls
+            )
+        return
+
+    # ffmpeg resamples straight to mono s16le on a pipe, so frames flow into SpeexDSP
+    # without an intermediate WAV file or a full in-memory decode.
+    command = [
+        AudioSegment.converter,
+        "-v",
+        "error",
+        "-nostdin",
+        "-i",
+        str(source_path),
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        pcm = _decode_pcm_in_memory(source_path, sample_rate)
+        _run_speexdsp_ns(io.BytesIO(pcm).read, output_path, sample_rate, frame_size, ns_cls)
+        return
+
+    with process:
+        _run_speexdsp_ns(process.stdout.read, output_path, sample_rate, frame_size, ns_cls)
+    if process.returncode != 0:
+        raise RuntimeError(f"Unable to decode audio file for noise suppression: {source_path}")
+
+
+def _is_ns_ready_wav(path: Path, sample_rate: int) -> bool:
+    if path.suffix.lower() != ".wav":
+        return False
+    try:
+        with wave.open(str(path), "rb") as reader:
+            return (
+                reader.getnchannels() == 1
+                and reader.getsampwidth() == 2
+                and reader.getframerate() == sample_rate
+            )
+    except (OSError, EOFError, wave.Error):
+        return False
+
+
+def _decode_pcm_in_memory(source_path: Path, sample_rate: int) -> bytes:
     try:
         audio = AudioSegment.from_file(source_path)
     except Exception as exc:
@@ -233,54 +563,43 @@ def _ensure_pcm_wav(source_path: Path, target_path: Path, sample_rate: int) -> N
             f"Unable to decode audio file for noise suppression: {source_path}"
         ) from exc
 
-    audio = audio.set_channels(1).set_sample_width(2).set_frame_rate(sample_rate)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    audio.export(target_path, format="wav")
+    return audio.set_channels(1).set_sample_width(2).set_frame_rate(sample_rate).raw_data
 
 
 def _run_speexdsp_ns(
-    input_path: Path, output_path: Path, frame_size: int, ns_cls: type
+    read: Callable[[int], bytes],
+    output_path: Path,
+    sample_rate: int,
+    frame_size: int,
+    ns_cls: type,
 ) -> None:
-    with wave.open(str(input_path), "rb") as reader:
-        channels = reader.getnchannels()
-        sample_width = reader.getsampwidth()
-        sample_rate = reader.getframerate()
-        if channels != 1 or sample_width != 2:
-            raise RuntimeError(
-                f"Expected mono 16-bit PCM WAV for noise suppression, got "
-                f"{channels}ch {sample_width * 8}bit."
-            )
-
-        ns = ns_cls.create(frame_size, sample_rate)
-
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with wave.open(str(output_path), "wb") as writer:
-            writer.setnchannels(1)
-            writer.setsampwidth(2)
-            writer.setframerate(sample_rate)
-
-            frame_bytes = frame_size * sample_width
-            while True:
-                raw = reader.readframes(frame_size)
-                if not raw:
-                    break
-                raw_len = len(raw)
-                if raw_len < frame_bytes:
-                    raw = raw + b"\x00" * (frame_bytes - raw_len)
-                    processed = ns.process(raw)
-                    writer.writeframes(processed[:raw_len])
-                    break
-                processed = ns.process(raw)
-                writer.writeframes(processed)
-
-
-def _load_diarized_entries(output_dir: Path) -> list[dict[str, Any]]:
-    json_files = sorted(output_dir.glob("*.json"))
+    ns = ns_cls.create(frame_size, sample_rate)
+
+    with wave.open(str(output_path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+
+        frame_bytes = frame_size * 2
+        # Bound methods are hoisted out of the per-frame loop (~50 iterations per second of audio);
+        # writeframesraw skips the per-call header patch and close() fixes the sizes once.
+        process = ns.process
+        write = writer.writeframesraw
+        raw = read(frame_bytes)
+        while len(raw) == frame_bytes:
+            write(process(raw))
+            raw = read(frame_bytes)
+        if raw:
+            raw_len = len(raw)
+            write(process(raw + b"\x00" * (frame_bytes - raw_len))[:raw_len])
+
+
+def _load_diarized_files(json_files: list[Path]) -> list[dict[str, Any]]:
     if not json_files:
         return []
     merged_entries: list[dict[str, Any]] = []
     for json_file in json_files:
-        data = json.loads(json_file.read_text(encoding="utf-8"))
+        data = _json_loads(json_file.read_bytes())
         entries: list[dict[str, Any]] = []
         if isinstance(data, dict):
             if "diarized_transcript" in data:
@@ -325,17 +644,29 @@ def _get_time(entry: dict[str, Any], *keys: str) -> float | None:
     return None
 
 
-def _format_transcript(entries: list[dict[str, Any]]) -> str:
-    lines: list[str] = []
+def _iter_transcript_lines(entries: list[dict[str, Any]]) -> Iterator[str]:
     for entry in entries:
-        start = _format_time(entry.get("start_time_seconds", 0))
-        end = _format_time(entry.get("end_time_seconds", 0))
-        speaker = entry.get("speaker_id", "speaker")
         transcript = entry.get("transcript", "").strip()
         if not transcript:
             continue
-        lines.append(f"[{start} - {end}] {speaker}: {transcript}")
-    return "\n".join(lines)
+        start = _format_time(entry.get("start_time_seconds", 0))
+        end = _format_time(entry.get("end_time_seconds", 0))
+        speaker = entry.get("speaker_id", "speaker")
+        yield f"[{start} - {end}] {speaker}: {transcript}"
+
+
+def _format_transcript(entries: list[dict[str, Any]]) -> str:
+    return "\n".join(_iter_transcript_lines(entries))
+
+
+def _write_transcript(path: Path, entries: list[dict[str, Any]]) -> None:
+    # Long calls can have thousands of lines; stream them instead of joining one big string.
+    lines = _iter_transcript_lines(entries)
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as handle:
+        first = next(lines, None)
+        if first is not None:
+            handle.write(first)
+            handle.writelines(f"\n{line}" for line in lines)
 
 
 def _format_time(seconds: float) -> str:
@@ -345,19 +676,20 @@ def _format_time(seconds: float) -> str:
 
 
 def _compute_speaker_stats(entries: list[dict[str, Any]]) -> dict[str, Any]:
-    stats: dict[str, dict[str, float]] = {}
+    # Flat per-speaker accumulators avoid a setdefault dict literal and two nested
+    # item updates on every entry; the per-speaker dicts are built once at the end.
+    durations: dict[str, float] = {}
+    word_counts: dict[str, int] = {}
     for entry in entries:
         speaker = entry.get("speaker_id", "speaker")
-        start = float(entry.get("start_time_seconds", 0))
-        end = float(entry.get("end_time_seconds", 0))
-        duration = max(0.0, end - start)
-        words = len(entry.get("transcript", "").split())
+        duration = float(entry.get("end_time_seconds", 0)) - float(entry.get("start_time_seconds", 0))
+        durations[speaker] = durations.get(speaker, 0.0) + (duration if duration > 0.0 else 0.0)
+        word_counts[speaker] = word_counts.get(speaker, 0) + len(entry.get("transcript", "").split())
 
-        speaker_stats = stats.setdefault(speaker, {"duration": 0.0, "words": 0})
-        speaker_stats["duration"] += duration
-        speaker_stats["words"] += words
-
-    return stats
+    return {
+        speaker: {"duration": duration, "words": word_counts[speaker]}
+        for speaker, duration in durations.items()
+    }
 
 
 def _cleanup_entries(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -367,7 +699,7 @@ def _cleanup_entries(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
     for entry in entries:
         transcript = entry.get("transcript", "")
         cleaned = _remove_fillers(str(transcript), filler_terms)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip(" ,.-")
+        cleaned = _WHITESPACE_RE.sub(" ", cleaned).strip(" ,.-")
         if not cleaned:
             continue
 
@@ -392,17 +724,26 @@ def _remove_fillers(text: str, fillers: list[str]) -> str:
     if not fillers:
         return text
 
-    cleaned = text
-    for filler in fillers:
-        if not filler:
-            continue
-        pattern = r"\b" + re.escape(filler) + r"\b"
-        cleaned = re.sub(pattern, " ", cleaned, flags=re.IGNORECASE)
+    pattern = _filler_pattern(tuple(fillers))
+    if pattern is None:
+        return text
+    cleaned = pattern.sub(" ", text)
 
-    cleaned = re.sub(r"\b(\w+)(\s+\1\b)+", r"\1", cleaned, flags=re.IGNORECASE)
+    cleaned = _REPEATED_WORD_RE.sub(r"\1", cleaned)
     return cleaned
 
 
+@functools.lru_cache(maxsize=8)
+def _filler_pattern(fillers: tuple[str, ...]) -> re.Pattern[str] | None:
+    # One alternation scans the text once instead of once per filler. It removes whichever
+    # filler matches at the leftmost position (first listed wins on ties), so overlapping
+    # fillers such as "know" and "you know" can differ from removing them one after another.
+    alternation = "|".join(re.escape(filler) for filler in fillers if filler)
+    if not alternation:
+        return None
+    return re.compile(r"\b(?:" + alternation + r")\b", re.IGNORECASE)
+
+
 def _prompt_pack_instructions(pack: str) -> str:
     pack = (pack or "general").strip().lower()
     if pack == "sales":
@@ -487,15 +828,43 @@ def _parse_auto_tags(tag_spec: str) -> dict[str, list[str]]:
     return tags
 
 
-def _apply_auto_tags(bundle: dict[str, Any], transcript_text: str) -> dict[str, Any]:
-    tag_map = _parse_auto_tags(settings.auto_tags)
+@functools.lru_cache(maxsize=4)
+def _auto_tag_matcher(
+    tag_spec: str,
+) -> tuple[re.Pattern[str], dict[str, frozenset[str]], tuple[str, ...]] | None:
+    tag_map = _parse_auto_tags(tag_spec)
     if not tag_map:
-        return bundle
-    text = transcript_text.lower()
-    tags = []
+        return None
+    labels_by_keyword: dict[str, set[str]] = {}
     for label, keywords in tag_map.items():
-        if any(keyword.lower() in text for keyword in keywords):
-            tags.append(label)
+        for keyword in keywords:
+            labels_by_keyword.setdefault(keyword.lower(), set()).add(label)
+    # The lookahead reports only the longest keyword starting at each offset, so each keyword
+    # also carries the labels of every keyword it contains to keep plain substring semantics.
+    keyword_labels = {
+        keyword: frozenset(
+            label
+            for other, labels in labels_by_keyword.items()
+            if other in keyword
+            for label in labels
+        )
+        for keyword in labels_by_keyword
+    }
+    alternation = "|".join(re.escape(keyword) for keyword in sorted(keyword_labels, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))"), keyword_labels, tuple(tag_map)
+
+
+def _apply_auto_tags(bundle: dict[str, Any], transcript_text: str) -> dict[str, Any]:
+    matcher = _auto_tag_matcher(settings.auto_tags)
+    if matcher is None:
+        return bundle
+    pattern, keyword_labels, labels = matcher
+    found: set[str] = set()
+    for match in pattern.finditer(transcript_text.lower()):
+        found.update(keyword_labels[match.group(1)])
+        if len(found) == len(labels):
+            break
+    tags = [label for label in labels if label in found]
     if tags:
         bundle["auto_tags"] = tags
     return bundle
@@ -555,25 +924,17 @@ def _maybe_rerun_low_confidence(
         (sentiment_conf is not None and sentiment_conf < settings.sentiment_confidence_threshold)
         or (role_conf is not None and role_conf < settings.role_confidence_threshold)
     ):
-        retry_prompt = (
-            "You are a call analytics assistant. Provide ONLY JSON with keys: "
-            "sentiment, speaker_roles, speaker_roles_confidence. "
-            "sentiment should include overall, customer, agent, confidence (0-1). "
-            "speaker_roles should map speaker_id to Agent, Customer, or Other. "
-            "speaker_roles_confidence should map speaker_id to confidence 0-1.\n\n"
-            f"{_prompt_pack_instructions(prompt_pack)}"
-            f"{_format_glossary(glossary_terms)}"
+        messages = _build_messages(
+            _RERUN_INSTRUCTIONS,
+            prompt_pack,
+            glossary_terms,
             f"{_format_context_prompt(context_prompt)}"
             f"Speaker stats: {json.dumps(speaker_stats)}\n\n"
             "Transcript:\n"
-            f"{transcript_text}"
+            f"{transcript_text}",
         )
-        messages = [
-            {"role": "system", "content": "You are a precise call analytics assistant."},
-            {"role": "user", "content": retry_prompt},
-        ]
         try:
-            rerun_text = sarvam.chat_completion(messages=messages, model=settings.sarvam_llm_model)
+            rerun_text = _cached_chat_completion(sarvam, messages)
             rerun_bundle = _safe_json_loads(rerun_text)
         except Exception:
             rerun_bundle = None
@@ -597,64 +958,23 @@ def _force_json_bundle(
     glossary_terms: str,
     context_prompt: str,
 ) -> dict[str, Any] | None:
-    retry_prompt = (
-        "Return ONLY JSON with keys: summary, sentiment, topics, action_items, resolution, "
-        "qa_pairs, speaker_roles, speaker_roles_confidence, compliance_flags. "
-        "summary should include short and bullets. "
-        "sentiment should include overall, customer, agent, confidence (0-1). "
-        "resolution should include status and next_steps. "
-        "qa_pairs should be an array of {question, answer}. "
-        "speaker_roles should map speaker_id to Agent, Customer, or Other. "
-        "speaker_roles_confidence should map speaker_id to confidence 0-1.\n\n"
-        f"{_prompt_pack_instructions(prompt_pack)}"
-        f"{_format_glossary(glossary_terms)}"
+    messages = _build_messages(
+        _FORCE_JSON_INSTRUCTIONS,
+        prompt_pack,
+        glossary_terms,
         f"{_format_context_prompt(context_prompt)}"
         f"Speaker stats: {json.dumps(speaker_stats)}\n\n"
         "Transcript:\n"
-        f"{transcript_text}"
+        f"{transcript_text}",
     )
-    messages = [
-        {"role": "system", "content": "You are a precise call analytics assistant."},
-        {"role": "user", "content": retry_prompt},
-    ]
     try:
-        retry_text = sarvam.chat_completion(messages=messages, model=settings.sarvam_llm_model)
+        retry_text = _cached_chat_completion(sarvam, messages)
         return _safe_json_loads(retry_text)
     except Exception:
         return None
 
 
 def _infer_roles_from_entries(entries: list[dict[str, Any]]) -> tuple[dict[str, str], dict[str, float]]:
-    agent_cues = [
-        "thank you for calling",
-        "how can i help",
-        "how may i help",
-        "i will",
-        "i can help",
-        "let me",
-        "ticket",
-        "reference number",
-        "policy",
-        "account number",
-        "apologies",
-        "sorry for the inconvenience",
-        "our company",
-    ]
-    customer_cues = [
-        "i need",
-        "i want",
-        "my issue",
-        "my problem",
-        "refund",
-        "complaint",
-        "not working",
-        "charged",
-        "why",
-        "when will",
-        "i was",
-        "i paid",
-    ]
-
     scores: dict[str, dict[str, float]] = {}
     for entry in entries:
         speaker_id = str(entry.get("speaker_id", "speaker"))
@@ -667,12 +987,13 @@ def _infer_roles_from_entries(entries: list[dict[str, Any]]) -> tuple[dict[str,
             speaker_id, {"agent": 0.0, "customer": 0.0, "duration": 0.0}
         )
         speaker_scores["duration"] += duration
-        for cue in agent_cues:
-            if cue in text:
-                speaker_scores["agent"] += 1.0
-        for cue in customer_cues:
-            if cue in text:
-                speaker_scores["customer"] += 1.0
+        matched: set[str] = set()
+        for cue in _ROLE_CUE_RE.findall(text):
+            matched |= _ROLE_CUE_CONTAINS[cue]
+        if matched:
+            agent_hits = len(matched & _AGENT_CUES)
+            speaker_scores["agent"] += agent_hits
+            speaker_scores["customer"] += len(matched) - agent_hits
 
     roles: dict[str, str] = {}
     confidences: dict[str, float] = {}
@@ -702,15 +1023,6 @@ def _infer_roles_from_entries(entries: list[dict[str, Any]]) -> tuple[dict[str,
 
 
 def _infer_names_from_entries(entries: list[dict[str, Any]]) -> dict[str, str]:
-    name_patterns = [
-        r"\bmy name is\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?",
-        r"\bthis is\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?",
-        r"\bi am\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?",
-        r"\bi'm\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?",
-        r"\bim\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?",
-        r"\byou'?re speaking with\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?",
-        r"\bspeaking with\s+([a-z][a-z'-]{1,})(?:\s+([a-z][a-z'-]{1,}))?",
-    ]
     stopwords = {
         "calling",
         "call",
@@ -781,8 +1093,12 @@ def _infer_names_from_entries(entries: list[dict[str, Any]]) -> dict[str, str]:
         text = str(entry.get("transcript", "")).lower()
         if not text:
             continue
-        for pattern in name_patterns:
-            match = re.search(pattern, text)
+        # Most utterances carry no introduction cue; one fused search rules them out before
+        # the ordered per-cue patterns (whose order decides which match wins) run.
+        if not _NAME_CUE_RE.search(text):
+            continue
+        for pattern in _NAME_PATTERNS:
+            match = pattern.search(text)
             if not match:
                 continue
             first = normalize_token(match.group(1))
@@ -820,40 +1136,23 @@ def _generate_analysis_bundle(
             + "\n[TRUNCATED]"
         )
 
-    pack_instructions = _prompt_pack_instructions(prompt_pack)
-    glossary_text = _format_glossary(glossary_terms)
     heuristic_roles, heuristic_confidence = _infer_roles_from_entries(entries)
     heuristic_names = _infer_names_from_entries(entries)
 
-    prompt = (
-        "You are a call analytics assistant. Analyze the transcript and speaker stats. "
-        "Return ONLY JSON with keys: summary, sentiment, topics, action_items, resolution, "
-        "qa_pairs, speaker_roles, speaker_roles_confidence, compliance_flags. "
-        "summary should include short and bullets. "
-        "sentiment should include overall, customer, agent, confidence (0-1). "
-        "resolution should include status and next_steps. "
-        "qa_pairs should be an array of {question, answer}. "
-        "speaker_roles should map speaker_id to Agent, Customer, or Other. "
-        "speaker_roles_confidence should map speaker_id to confidence 0-1. "
-        "speaker_names should map speaker_id to a name string or null. "
-        "If unsure, use null or empty arrays.\n\n"
-        f"{pack_instructions}"
-        f"{glossary_text}"
+    messages = _build_messages(
+        _ANALYSIS_INSTRUCTIONS,
+        prompt_pack,
+        glossary_terms,
         f"{_format_context_prompt(context_prompt)}"
         f"Heuristic roles (use as fallback): {json.dumps(heuristic_roles)}\n"
         f"Heuristic role confidence: {json.dumps(heuristic_confidence)}\n\n"
         f"Heuristic names (use as fallback): {json.dumps(heuristic_names)}\n\n"
         f"Speaker stats: {json.dumps(speaker_stats)}\n\n"
         "Transcript:\n"
-        f"{truncated_transcript}"
+        f"{truncated_transcript}",
     )
 
-    messages = [
-        {"role": "system", "content": "You are a precise call analytics assistant."},
-        {"role": "user", "content": prompt},
-    ]
-
-    raw_text = sarvam.chat_completion(messages=messages, model=settings.sarvam_llm_model)
+    raw_text = _cached_chat_completion(sarvam, messages)
     bundle = _safe_json_loads(raw_text)
     if bundle is None and settings.enable_fallback_prompt:
         forced_bundle = _force_json_bundle(
@@ -900,6 +1199,101 @@ def _generate_analysis_bundle(
     return bundle, raw_text
 
 
+def _build_messages(
+    instructions: str,
+    prompt_pack: str,
+    glossary_terms: str,
+    user_content: str,
+) -> list[dict[str, str]]:
+    # Everything that is fixed for a pack/glossary goes in the system message so repeat
+    # calls share a byte-identical prefix the provider can cache; per-call data follows.
+    system_content = (
+        f"{_SYSTEM_PROMPT}\n\n{instructions}\n\n"
+        f"{_prompt_pack_instructions(prompt_pack)}"
+        f"{_format_glossary(glossary_terms)}"
+    ).rstrip()
+    return [
+        {"role": "system", "content": system_content},
+        {"role": "user", "content": user_content},
+    ]
+
+
+def _cached_chat_completion(sarvam: SarvamService, messages: list[dict[str, str]]) -> str:
+    model = settings.sarvam_llm_model
+    ttl_seconds = settings.llm_cache_ttl_seconds
+    if ttl_seconds <= 0:
+        return sarvam.chat_completion(messages=messages, model=model)
+
+    # The messages already embed transcript, pack, glossary and context, so they plus the
+    # model fully determine the request.
+    key_blob = json.dumps([model, messages], sort_keys=True).encode("utf-8")
+    cache_path = settings.llm_cache_dir / f"{hashlib.blake2b(key_blob, digest_size=16).hexdigest()}.json"
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if time.time() - float(cached["created_at"]) < ttl_seconds:
+            return str(cached["text"])
+        cache_path.unlink(missing_ok=True)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    text = sarvam.chat_completion(messages=messages, model=model)
+    if _safe_json_loads(text) is None:
+        # Never pin an unparseable answer; the fallback prompt should get a fresh try.
+        return text
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"created_at": time.time(), "model": model, "text": text}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        logger.warning("Unable to write LLM response cache entry %s", cache_path, exc_info=True)
+    _sweep_llm_cache(cache_path.parent, ttl_seconds)
+    return text
+
+
+def _sweep_llm_cache(cache_dir: Path, ttl_seconds: int) -> None:
+    # Most keys embed a unique transcript and are never read again, so expired entries are
+    # swept by age at most once an hour instead of only when their key comes back.
+    global _llm_cache_next_sweep
+    now = time.monotonic()
+    with _LLM_CACHE_SWEEP_LOCK:
+        if now < _llm_cache_next_sweep:
+            return
+        _llm_cache_next_sweep = now + LLM_CACHE_SWEEP_INTERVAL_SECONDS
+    cutoff = time.time() - ttl_seconds
+    try:
+        entries = list(os.scandir(cache_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            continue
+
+
+def _json_dumps(payload: object) -> bytes:
+    # Output artifacts stay indented for people reading them; orjson does that natively.
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects integers beyond 64 bits, which stdlib json.loads happily produces
+            # from LLM output (long account or reference numbers).
+            pass
+    return json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def _safe_json_loads(text: str) -> dict[str, Any] | None:
     cleaned = text.strip()
     if cleaned.startswith("```"):
@@ -0,0 +1,12 @@
+import json
+
+from django.test import SimpleTestCase
+
+from app.services.pipeline import _json_dumps
+
+
+class JsonDumpsTests(SimpleTestCase):
+    def test_integers_beyond_64_bits_are_serialized(self) -> None:
+        bundle = {"summary": {"short": "Refund issued"}, "reference_number": 98765432109876543210}
+
+        self.assertEqual(json.loads(_json_dumps(bundle)), bundle)